@@ -0,0 +1,387 @@
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import database
+from database import (
+    DATABASE_URL,
+    DB_POOL_MIN_SIZE,
+    DB_POOL_MAX_SIZE,
+    DB_POOL_TIMEOUT,
+    PREFERENCE_FIELDS,
+    DatabaseError,
+    build_jobs_query,
+    finish_jobs_page,
+    parse_jobs_cursor
+)
+from statements import statements, numbered_placeholders
+from metrics import timed_db_call
+
+# Try to import asyncpg
+try:
+    import asyncpg
+    HAS_ASYNCPG = True
+except ImportError:
+    HAS_ASYNCPG = False
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Connection pool, created on first use in the event loop that serves the API
+_pool = None
+_pool_lock = asyncio.Lock()
+_pool_failed = False
+
+async def _init_connection(conn) -> None:
+    # Decode JSONB columns like psycopg2 does
+    await conn.set_type_codec("jsonb", encoder=json.dumps, decoder=json.loads, schema="pg_catalog")
+
+async def get_pool():
+    """
+    Get or create the asyncpg connection pool.
+    Returns None if asyncpg isn't installed, the mock or SQLite database is in use or PostgreSQL can't be reached.
+    """
+    global _pool, _pool_failed
+
+    if database.MOCK_DB or database.DB_BACKEND != "postgres" or not HAS_ASYNCPG or _pool_failed:
+        return None
+    if _pool is not None:
+        return _pool
+
+    async with _pool_lock:
+        if _pool is None and not _pool_failed:
+            try:
+                _pool = await asyncpg.create_pool(
+                    DATABASE_URL,
+                    min_size=min(DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE),
+                    max_size=DB_POOL_MAX_SIZE,
+                    init=_init_connection
+                )
+                logger.info(f"Async database connection pool opened with up to {DB_POOL_MAX_SIZE} connection(s)")
+            except Exception as e:
+                logger.error(f"Async database connection error: {e}")
+                logger.info("Falling back to the sync database layer")
+                _pool_failed = True
+    return _pool
+
+async def close_pool() -> None:
+    """
+    Close all pooled async database connections.
+    """
+    global _pool
+
+    async with _pool_lock:
+        if _pool is not None:
+            await _pool.close()
+            _pool = None
+
+async def _sync(fn: Callable, *args) -> Any:
+    """
+    Answer with the sync implementation in database.py: directly for the in-memory mock
+    database, otherwise in a worker thread so the event loop keeps serving other requests.
+    """
+    if database.MOCK_DB:
+        return fn(*args)
+    return await asyncio.to_thread(fn, *args)
+
+@timed_db_call("async")
+async def get_jobs_page(filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None,
+                        cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Get one page of jobs with optional filtering; see database.get_jobs_page.
+
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    pool = await get_pool()
+    if pool is None:
+        return await _sync(database.get_jobs_page, filters, limit, cursor)
+
+    keywords = (filters or {}).get("keywords")
+    after = parse_jobs_cursor(cursor, keywords)
+
+    try:
+        query, params = build_jobs_query(filters, limit, after)
+        async with pool.acquire(timeout=DB_POOL_TIMEOUT) as conn:
+            rows = await conn.fetch(numbered_placeholders(query), *params)
+
+        return finish_jobs_page([dict(row) for row in rows], limit, keywords)
+
+    except Exception as e:
+        logger.error(f"Error fetching jobs: {e}")
+        return database.MOCK_JOBS, None
+
+@timed_db_call("async")
+async def get_jobs(filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None,
+                   cursor: Optional[str] = None) -> List[Dict[str, Any]]:
+    """
+    Get jobs with optional filtering; see database.get_jobs.
+    """
+    return (await get_jobs_page(filters, limit, cursor))[0]
+
+@timed_db_call("async")
+async def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
+    """
+    Get user by email.
+
+    Args:
+        email: User email
+
+    Returns:
+        User as a dictionary or None if not found
+    """
+    pool = await get_pool()
+    if pool is None:
+        return await _sync(database.get_user_by_email, email)
+
+    try:
+        async with pool.acquire(timeout=DB_POOL_TIMEOUT) as conn:
+            row = await statements.fetchrow(conn, "user_by_email", email)
+
+        return dict(row) if row else None
+
+    except Exception as e:
+        logger.error(f"Error fetching user by email: {e}")
+        return await _sync(database.get_user_by_email, email)
+
+@timed_db_call("async")
+async def create_user(email: str, password_hash: str, first_name: str = None, last_name: str = None) -> Dict[str, Any]:
+    """
+    Create a new user.
+
+    Args:
+        email: User email
+        password_hash: Hashed password
+        first_name: User's first name (optional)
+        last_name: User's last name (optional)
+
+    Returns:
+        New user as a dictionary
+    """
+    pool = await get_pool()
+    if pool is None:
+        return await _sync(database.create_user, email, password_hash, first_name, last_name)
+
+    try:
+        async with pool.acquire(timeout=DB_POOL_TIMEOUT) as conn:
+            row = await statements.fetchrow(conn, "create_user", email, password_hash, first_name, last_name)
+
+        return dict(row)
+
+    except Exception as e:
+        logger.error(f"Error creating user: {e}")
+        return await _sync(database.create_user, email, password_hash, first_name, last_name)
+
+@timed_db_call("async")
+async def update_last_login(user_id: int) -> None:
+    """
+    Update user's last login timestamp.
+
+    Args:
+        user_id: ID of the user
+    """
+    pool = await get_pool()
+    if pool is None:
+        return await _sync(database.update_last_login, user_id)
+
+    try:
+        async with pool.acquire(timeout=DB_POOL_TIMEOUT) as conn:
+            await statements.fetch(conn, "update_last_login", user_id)
+
+    except Exception as e:
+        logger.error(f"Error updating last login: {e}")
+
+@timed_db_call("async")
+async def update_user_preferences(user_id: int, preferences: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Update user preferences, creating them on first use.
+
+    Args:
+        user_id: ID of the user
+        preferences: Dictionary of preferences to update
+
+    Returns:
+        Updated preferences as a dictionary
+    """
+    pool = await get_pool()
+    if pool is None:
+        return await _sync(database.update_user_preferences, user_id, preferences)
+
+    values = {key: value for key, value in preferences.items() if key in PREFERENCE_FIELDS}
+
+    try:
+        async with pool.acquire(timeout=DB_POOL_TIMEOUT) as conn:
+            async with conn.transaction():
+                existing = await conn.fetchrow(
+                    "SELECT * FROM user_preferences WHERE user_id = $1 FOR UPDATE", user_id
+                )
+
+                if existing:
+                    if not values:
+                        return dict(existing)
+                    set_clauses = [f"{key} = ${i}" for i, key in enumerate(values, start=2)]
+                    row = await conn.fetchrow(
+                        f"""
+                        UPDATE user_preferences SET {', '.join(set_clauses)}, updated_at = CURRENT_TIMESTAMP
+                        WHERE user_id = $1 RETURNING *
+                        """,
+                        user_id, *values.values()
+                    )
+                else:
+                    values.setdefault("email_notifications", False)
+                    columns = ["user_id", *values]
+                    placeholders = [f"${i}" for i in range(1, len(columns) + 1)]
+                    row = await conn.fetchrow(
+                        f"""
+                        INSERT INTO user_preferences ({', '.join(columns)})
+                        VALUES ({', '.join(placeholders)})
+                        RETURNING *
+                        """,
+                        user_id, *values.values()
+                    )
+
+        return dict(row)
+
+    except Exception as e:
+        logger.error(f"Error updating user preferences: {e}")
+        return await _sync(database.update_user_preferences, user_id, preferences)
+
+@timed_db_call("async")
+async def save_jobs_for_user(user_id: int, job_ids: List[int]) -> List[Dict[str, Any]]:
+    """
+    Save several jobs for a user in one atomic statement; see database.save_jobs_for_user.
+    """
+    job_ids = list(dict.fromkeys(job_ids))
+
+    pool = await get_pool()
+    if pool is None:
+        return await _sync(database.save_jobs_for_user, user_id, job_ids)
+
+    if not job_ids:
+        return []
+
+    try:
+        async with pool.acquire(timeout=DB_POOL_TIMEOUT) as conn:
+            rows = await statements.fetch(conn, "save_jobs", user_id, job_ids, user_id, user_id, job_ids)
+
+        return [dict(row) for row in rows]
+
+    except Exception as e:
+        logger.error(f"Error saving jobs: {e}")
+        raise DatabaseError("Could not save jobs") from e
+
+@timed_db_call("async")
+async def save_job_for_user(user_id: int, job_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Save a job for a user.
+
+    Args:
+        user_id: ID of the user
+        job_id: ID of the job
+
+    Returns:
+        Saved job as a dictionary (the existing one if it was already saved), or None if the job doesn't exist
+    """
+    results = await save_jobs_for_user(user_id, [job_id])
+    if not results:
+        return None
+
+    saved_job = dict(results[0])
+    saved_job.pop("created", None)
+    return saved_job
+
+@timed_db_call("async")
+async def get_saved_jobs(user_id: int) -> List[Dict[str, Any]]:
+    """
+    Get saved jobs for a user.
+
+    Args:
+        user_id: ID of the user
+
+    Returns:
+        List of saved jobs as dictionaries
+    """
+    pool = await get_pool()
+    if pool is None:
+        return await _sync(database.get_saved_jobs, user_id)
+
+    try:
+        async with pool.acquire(timeout=DB_POOL_TIMEOUT) as conn:
+            rows = await statements.fetch(conn, "saved_jobs", user_id)
+
+        return [dict(row) for row in rows]
+
+    except Exception as e:
+        logger.error(f"Error fetching saved jobs: {e}")
+        return await _sync(database.get_saved_jobs, user_id)
+
+@timed_db_call("async")
+async def get_saved_jobs_version(user_id: int) -> int:
+    """
+    Get the version of a user's saved jobs; see database.get_saved_jobs_version.
+    """
+    pool = await get_pool()
+    if pool is None:
+        return await _sync(database.get_saved_jobs_version, user_id)
+
+    try:
+        async with pool.acquire(timeout=DB_POOL_TIMEOUT) as conn:
+            row = await statements.fetchrow(conn, "saved_jobs_version", user_id)
+
+        return row["saved_jobs_version"] if row else 0
+
+    except Exception as e:
+        logger.error(f"Error fetching saved jobs version: {e}")
+        return await _sync(database.get_saved_jobs_version, user_id)
+
+@timed_db_call("async")
+async def unsave_jobs_for_user(user_id: int, job_ids: List[int]) -> List[int]:
+    """
+    Remove several jobs from a user's saved jobs in one statement; see database.unsave_jobs_for_user.
+    """
+    job_ids = list(dict.fromkeys(job_ids))
+
+    pool = await get_pool()
+    if pool is None:
+        return await _sync(database.unsave_jobs_for_user, user_id, job_ids)
+
+    if not job_ids:
+        return []
+
+    try:
+        async with pool.acquire(timeout=DB_POOL_TIMEOUT) as conn:
+            rows = await statements.fetch(conn, "unsave_jobs", user_id, job_ids, user_id)
+
+        return [row["job_id"] for row in rows]
+
+    except Exception as e:
+        logger.error(f"Error unsaving jobs: {e}")
+        raise DatabaseError("Could not remove saved jobs") from e
+
+@timed_db_call("async")
+async def unsave_job_for_user(user_id: int, job_id: int) -> Dict[str, Any]:
+    """
+    Remove a job from user's saved jobs.
+
+    Args:
+        user_id: ID of the user
+        job_id: ID of the job
+
+    Returns:
+        Status information as a dictionary
+    """
+    if await unsave_jobs_for_user(user_id, [job_id]):
+        return {
+            "removed": True,
+            "user_id": user_id,
+            "job_id": job_id
+        }
+
+    return {
+        "removed": False,
+        "user_id": user_id,
+        "job_id": job_id,
+        "message": "Job was not saved"
+    }
@@ -8,6 +8,7 @@ from pydantic import BaseModel
 import os
 from dotenv import load_dotenv
 import secrets
+import asyncio
 
 # Load environment variables
 load_dotenv()
@@ -104,4 +105,16 @@ def authenticate_user(email: str, password: str, get_user_func):
     if not verify_password(password, user["password_hash"]):
         return False
         
-    return user 
\ No newline at end of file
+    return user 
+
+async def authenticate_user_async(email: str, password: str, get_user_func):
+    """Authenticate a user with an async user lookup, checking the password hash off the event loop."""
+    user = await get_user_func(email)
+    
+    if not user:
+        return False
+        
+    if not await asyncio.to_thread(verify_password, password, user["password_hash"]):
+        return False
+        
+    return user
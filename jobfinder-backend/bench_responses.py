@@ -0,0 +1,118 @@
+import os
+import sys
+import time
+import random
+import argparse
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from psycopg2.extras import RealDictRow
+from starlette.responses import JSONResponse
+
+import responses
+from responses import FastJSONResponse, compress
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Timed runs per stage; the fastest one is reported
+BENCH_REPEAT = int(os.getenv("BENCH_REPEAT", "20"))
+
+# Job list sizes benchmarked: a broad search page and a large saved jobs list
+PAYLOAD_SIZES = [100, 1000]
+
+WORDS = ("python react node sql aws docker kubernetes backend frontend cloud data team product "
+         "customer experience build scale design services platform remote hybrid benefits").split()
+
+def make_jobs(count: int) -> List[RealDictRow]:
+    """Jobs shaped like rows of the saved jobs query, with realistic description lengths"""
+    random.seed(count)
+    now = datetime.now(timezone.utc)
+    jobs = []
+    for i in range(count):
+        row = RealDictRow()
+        row.update({
+            "id": i + 1,
+            "title": f"{random.choice(WORDS).title()} Engineer",
+            "company": f"Company {i % 97}",
+            "location": random.choice(["San Francisco, CA", "New York, NY", "Remote", "Austin, TX"]),
+            "description": " ".join(random.choices(WORDS, k=random.randint(80, 250))),
+            "salary_range": "$120,000 - $150,000",
+            "job_type": "Full-time",
+            "experience_level": random.choice(["Junior", "Mid-level", "Senior"]),
+            "skills": random.sample(WORDS, 4),
+            "posted_at": now - timedelta(hours=i),
+            "link": f"https://www.indeed.com/viewjob?jk={i:016x}",
+            "salary_min": 120000,
+            "salary_max": 150000,
+            "salary_period": "year",
+            "saved_at": now - timedelta(minutes=i)
+        })
+        jobs.append(row)
+    return jobs
+
+def build_stages(jobs: List[RealDictRow]) -> Dict[str, Callable[[], Any]]:
+    """
+    Stages are default (what FastAPI does for a returned list: jsonable_encoder, then
+    json.dumps in JSONResponse), fast (FastJSONResponse, as the job list endpoints
+    return), and gzip / br (compressing the fast body at the configured levels).
+    """
+    body = FastJSONResponse(jobs).body
+    stages = {
+        "default": lambda: JSONResponse(jsonable_encoder(jobs)),
+        "fast": lambda: FastJSONResponse(jobs),
+        "gzip": lambda: compress(body, "gzip"),
+    }
+    if responses.HAS_BROTLI:
+        stages["br"] = lambda: compress(body, "br")
+    return stages
+
+def output_size(name: str, jobs: List[RealDictRow]) -> int:
+    if name == "default":
+        return len(JSONResponse(jsonable_encoder(jobs)).body)
+    body = FastJSONResponse(jobs).body
+    return len(body) if name == "fast" else len(compress(body, name))
+
+def run_stage(fn: Callable[[], Any], repeat: int) -> float:
+    """Fastest of repeat runs, in seconds"""
+    fn()  # Warm up
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def run_benchmarks(repeat: int = BENCH_REPEAT) -> List[Tuple[int, str, float, int]]:
+    """
+    Returns:
+        (jobs, stage, seconds, output bytes) for every payload size and stage
+    """
+    results = []
+    for count in PAYLOAD_SIZES:
+        jobs = make_jobs(count)
+        for name, fn in build_stages(jobs).items():
+            results.append((count, name, run_stage(fn, repeat), output_size(name, jobs)))
+    return results
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark JSON serialization and compression of job lists")
+    parser.add_argument("--repeat", type=int, default=BENCH_REPEAT, help="Timed runs per stage")
+    args = parser.parse_args()
+
+    print(f"orjson: {'yes' if responses.HAS_ORJSON else 'no (json fallback)'}, "
+          f"brotli: {'yes' if responses.HAS_BROTLI else 'no'}")
+    print(f"{'jobs':>5} {'stage':<8} {'ms':>9} {'jobs/sec':>11} {'KB':>9} {'vs default':>11}")
+    default = {}
+    for count, name, seconds, size in run_benchmarks(args.repeat):
+        if name == "default":
+            default[count] = seconds
+        speedup = f"{default[count] / seconds:.1f}x" if name == "fast" else ""
+        print(f"{count:>5} {name:<8} {seconds * 1000:>9.2f} {count / seconds:>11.0f} {size / 1024:>9.1f} {speedup:>11}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
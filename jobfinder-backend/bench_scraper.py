@@ -0,0 +1,309 @@
+import gc
+import os
+import re
+import sys
+import json
+import glob
+import math
+import time
+import random
+import statistics
+import argparse
+import tracemalloc
+import logging
+from typing import Any, Callable, Dict, List, Tuple
+
+from job_parser import FIXTURES_DIR, resolve_engine, select_job_cards
+import indeed_scraper
+import linkedin_scraper
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Results of a known-good run that later runs are compared against
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bench_baseline.json")
+
+# Allowed slowdown (or memory growth) relative to the baseline before a stage counts as a regression.
+# Timings are compared relative to the calibrate stage of the same run, so the baseline carries
+# over between machines that are faster or slower overall
+BENCH_THRESHOLD = float(os.getenv("BENCH_THRESHOLD", "0.25"))
+
+# Timed samples per stage; the median is reported
+BENCH_REPEAT = int(os.getenv("BENCH_REPEAT", "15"))
+
+# Each sample runs a stage over the fixture pages as many times as fit in this many seconds,
+# so sub-millisecond stages aren't timed at the resolution of the clock and the scheduler
+BENCH_SAMPLE_SECONDS = float(os.getenv("BENCH_SAMPLE_SECONDS", "0.03"))
+
+# Runs whose per-stage medians are recorded by --save-baseline
+BENCH_BASELINE_RUNS = int(os.getenv("BENCH_BASELINE_RUNS", "3"))
+
+# Stage every other stage's timing is divided by
+CALIBRATION_STAGE = "calibrate"
+
+def load_pages(fixtures_dir: str = FIXTURES_DIR) -> List[str]:
+    """Read the recorded result pages"""
+    pages = []
+    for path in sorted(glob.glob(os.path.join(fixtures_dir, "*.html"))):
+        with open(path, encoding="utf-8") as f:
+            pages.append(f.read())
+    return pages
+
+def classify_indeed(scraper, jobs: List[Dict[str, Any]]) -> None:
+    for job in jobs:
+        indeed_scraper.determine_job_type(job["title"], job["description"])
+        indeed_scraper.determine_experience_level(job["title"])
+        indeed_scraper.extract_skills_from_description(job["description"])
+
+def classify_linkedin(scraper, jobs: List[Dict[str, Any]]) -> None:
+    for job in jobs:
+        scraper._determine_job_type(job["title"], job["description"])
+        scraper._determine_experience_level(job["title"], job["description"])
+        scraper._extract_skills_from_title(job["title"])
+
+# Scraper modules under test and their classifier stage
+MODULES = {
+    "indeed_scraper": (indeed_scraper.IndeedScraper, classify_indeed),
+    "linkedin_scraper": (linkedin_scraper.IndeedScraper, classify_linkedin),
+}
+
+def build_stages(pages: List[str], engine: str) -> Dict[str, Tuple[Callable[[], Any], int]]:
+    """
+    Build the benchmarked stages as (callable, cards processed per call).
+
+    Stages are calibrate (a reference workload that doesn't touch the scrapers),
+    select (HTML to job card elements), parse_card (_parse_job_card on already
+    selected cards), classify (job type, experience level and skills from parsed
+    text) and page_loop (select and parse every card, as the scrapers do for each
+    fetched page).
+    """
+    cards = [card for html in pages for card in select_job_cards(html, engine)]
+    stages = {}
+
+    def calibrate():
+        # Regex scanning and dictionary counting over the same pages, standing in for the
+        # speed of the machine rather than of the code under test
+        for html in pages:
+            counts: Dict[str, int] = {}
+            for word in re.findall(r"[a-z]+", html.lower()):
+                counts[word] = counts.get(word, 0) + 1
+    stages[CALIBRATION_STAGE] = (calibrate, len(cards))
+
+    def select():
+        for html in pages:
+            select_job_cards(html, engine)
+    stages["select"] = (select, len(cards))
+
+    for name, (scraper_cls, classify) in MODULES.items():
+        scraper = scraper_cls()
+        # Fallback values in linkedin_scraper are random; seed so every run does the same work
+        random.seed(0)
+        jobs = [job for job in (scraper._parse_job_card(card) for card in cards) if job]
+
+        def parse_card(scraper=scraper):
+            random.seed(0)
+            for card in cards:
+                scraper._parse_job_card(card)
+
+        def page_loop(scraper=scraper):
+            random.seed(0)
+            for html in pages:
+                for card in select_job_cards(html, engine):
+                    scraper._parse_job_card(card)
+
+        def classify_jobs(scraper=scraper, classify=classify, jobs=jobs):
+            random.seed(0)
+            classify(scraper, jobs)
+
+        stages[f"{name}.parse_card"] = (parse_card, len(cards))
+        stages[f"{name}.classify"] = (classify_jobs, len(jobs))
+        stages[f"{name}.page_loop"] = (page_loop, len(cards))
+
+    return stages
+
+def _loops(fn: Callable[[], Any], sample_seconds: float) -> int:
+    """Calls of fn that take about sample_seconds"""
+    start = time.perf_counter()
+    fn()
+    return max(1, math.ceil(sample_seconds / max(time.perf_counter() - start, 1e-6)))
+
+def _sample(fn: Callable[[], Any], loops: int) -> float:
+    """Seconds per call of fn over loops calls, without garbage collection pauses"""
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        return (time.perf_counter() - start) / loops
+    finally:
+        gc.enable()
+
+def peak_memory(fn: Callable[[], Any]) -> int:
+    """Peak traced memory of one call in bytes, measured apart from the timings since tracing is slow"""
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+def run_benchmarks(engine: str = None, repeat: int = BENCH_REPEAT,
+                   sample_seconds: float = BENCH_SAMPLE_SECONDS) -> Dict[str, Any]:
+    """
+    Run every stage against the recorded pages.
+
+    Every sample of a stage is paired with a sample of the calibrate stage taken right
+    before it, so a machine that slows down (frequency scaling, noisy neighbours) slows
+    both and leaves their ratio alone. Stages take turns, one sample each, so a burst of
+    load touches a few samples of every stage rather than all samples of one; the
+    medians leave those out.
+
+    Args:
+        engine: Parser backend (defaults to PARSER_ENGINE)
+        repeat: Timed samples per stage
+        sample_seconds: Approximate duration of each sample
+
+    Returns:
+        Dictionary with the engine, page/card counts and per-stage results: median seconds
+        per pass over the pages, and median time relative to the calibrate stage
+    """
+    engine = resolve_engine(engine)
+    pages = load_pages()
+    if not pages:
+        raise RuntimeError(f"No fixture pages found in {FIXTURES_DIR}")
+
+    stages = build_stages(pages, engine)
+    calibrate = stages[CALIBRATION_STAGE][0]
+    loops = {}
+    for name, (fn, _) in stages.items():
+        fn()  # Warm up caches (compiled selectors, regexes)
+        loops[name] = _loops(fn, sample_seconds)
+
+    samples: Dict[str, List[float]] = {name: [] for name in stages}
+    ratios: Dict[str, List[float]] = {name: [] for name in stages}
+    for _ in range(repeat):
+        for name, (fn, _) in stages.items():
+            reference = _sample(calibrate, loops[CALIBRATION_STAGE])
+            seconds = _sample(fn, loops[name])
+            samples[name].append(seconds)
+            ratios[name].append(seconds / reference)
+
+    results = {}
+    for name, (fn, cards) in stages.items():
+        seconds = statistics.median(samples[name])
+        results[name] = {
+            "seconds": round(seconds, 6),
+            "relative": round(statistics.median(ratios[name]), 4),
+            "cards": cards,
+            "cards_per_sec": round(cards / seconds, 1) if seconds > 0 else 0.0,
+            "peak_kb": round(peak_memory(fn) / 1024, 1)
+        }
+
+    return {"engine": engine, "pages": len(pages), "results": results}
+
+def median_report(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine runs into one report holding the median of every per-stage number"""
+    results = {}
+    for name, result in reports[0]["results"].items():
+        results[name] = {
+            key: statistics.median(report["results"][name][key] for report in reports)
+            for key in result
+        }
+    return {**reports[0], "results": results}
+
+def compare(report: Dict[str, Any], baseline: Dict[str, Any],
+            threshold: float = BENCH_THRESHOLD) -> List[Tuple[str, str]]:
+    """
+    Compare a run against the baseline.
+
+    Returns:
+        (stage, description) of the stages that got slower or use more memory than the threshold allows
+    """
+    regressions = []
+    if baseline.get("engine") != report["engine"]:
+        # Timings of different parser backends are not comparable
+        logger.warning(f"Baseline was recorded with the {baseline.get('engine')} engine, this run used "
+                       f"{report['engine']}; skipping the regression check")
+        return regressions
+
+    for name, result in report["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            continue
+        if name != CALIBRATION_STAGE and "relative" in base and result["relative"] > base["relative"] * (1 + threshold):
+            regressions.append((name, (
+                f"{name}: {result['relative']:.2f}x calibrate vs {base['relative']:.2f}x baseline "
+                f"({result['seconds'] * 1000:.2f} ms)"
+            )))
+        if result["peak_kb"] > base["peak_kb"] * (1 + threshold):
+            regressions.append((name, f"{name}: peak {result['peak_kb']:.1f} KB vs {base['peak_kb']:.1f} KB baseline"))
+    return regressions
+
+def print_report(report: Dict[str, Any], baseline: Dict[str, Any] = None) -> None:
+    print(f"Engine: {report['engine']}, {report['pages']} fixture page(s)")
+    if baseline and baseline.get("engine") != report["engine"]:
+        baseline = None
+    print(f"{'stage':<30} {'ms':>9} {'cards/sec':>11} {'peak KB':>9} {'relative':>9} {'vs base':>8}")
+    for name, result in report["results"].items():
+        change = ""
+        base = (baseline or {}).get("results", {}).get(name)
+        if base and base.get("relative") and name != CALIBRATION_STAGE:
+            change = f"{(result['relative'] / base['relative'] - 1) * 100:+.0f}%"
+        print(f"{name:<30} {result['seconds'] * 1000:>9.2f} {result['cards_per_sec']:>11.1f} "
+              f"{result['peak_kb']:>9.1f} {result['relative']:>9.3f} {change:>8}")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Benchmark job card parsing on the recorded Indeed pages")
+    parser.add_argument("--engine", help="Parser backend (auto, selectolax, lxml or bs4)")
+    parser.add_argument("--repeat", type=int, default=BENCH_REPEAT, help="Timed samples per stage")
+    parser.add_argument("--threshold", type=float, default=BENCH_THRESHOLD,
+                        help="Allowed slowdown relative to the baseline, e.g. 0.25 for 25%%")
+    parser.add_argument("--baseline", default=BASELINE_PATH, help="Baseline results file")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help=f"Record the median of {BENCH_BASELINE_RUNS} runs as the new baseline")
+    args = parser.parse_args()
+
+    if args.save_baseline:
+        report = median_report([run_benchmarks(args.engine, args.repeat) for _ in range(max(1, BENCH_BASELINE_RUNS))])
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+        print_report(report)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    report = run_benchmarks(args.engine, args.repeat)
+    baseline = None
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    print_report(report, baseline)
+
+    if baseline is None:
+        print("No baseline found; run with --save-baseline to record one")
+        return 0
+
+    regressions = compare(report, baseline, args.threshold)
+    if regressions:
+        # A slower stage has to be slower again in a second run to count, so one burst of
+        # load on a shared CI runner doesn't fail the build
+        print(f"{len(regressions)} stage(s) beyond {args.threshold:.0%}; running again to confirm")
+        flagged = {name for name, _ in regressions}
+        confirmation = run_benchmarks(args.engine, args.repeat)
+        regressions = [
+            (name, description) for name, description in compare(confirmation, baseline, args.threshold)
+            if name in flagged
+        ]
+    if regressions:
+        print(f"Regressions beyond {args.threshold:.0%}:")
+        for _, description in regressions:
+            print(f"  {description}")
+        return 1
+
+    print(f"No regressions beyond {args.threshold:.0%}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,149 @@
+import os
+import sys
+import glob
+import time
+import asyncio
+import argparse
+import threading
+import logging
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List
+from urllib.parse import parse_qs, urlparse
+
+from job_parser import FIXTURES_DIR, select_job_cards
+from rate_limiter import RateLimiter
+import linkedin_scraper
+from linkedin_scraper import IndeedScraper, JOBS_PER_PAGE, MAX_CONCURRENT_PAGES
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Seconds the stub holds back every response, so overlapping requests show up
+STUB_DELAY = float(os.getenv("STUB_DELAY", "0.2"))
+
+class StubIndeedServer:
+    def __init__(self, fixtures_dir: str = FIXTURES_DIR, delay: float = STUB_DELAY):
+        """
+        Local HTTP server serving the recorded result pages in place of Indeed, for
+        exercising the concurrent fetcher without network access.
+
+        The page for ?start=N is the (N / JOBS_PER_PAGE + 1)th fixture page in name order;
+        pages past the last fixture have no job cards. Every response waits delay seconds,
+        so overlapping requests show up in peak_concurrency.
+
+        Args:
+            fixtures_dir: Directory of recorded result pages
+            delay: Seconds each response is held back
+        """
+        self.pages = []
+        for path in sorted(glob.glob(os.path.join(fixtures_dir, "*.html"))):
+            with open(path, encoding="utf-8") as f:
+                self.pages.append(f.read())
+        self.delay = delay
+        self.requests = 0
+        self.in_flight = 0
+        self.peak_concurrency = 0
+        self._lock = threading.Lock()
+
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    stub.in_flight += 1
+                    stub.peak_concurrency = max(stub.peak_concurrency, stub.in_flight)
+                try:
+                    time.sleep(stub.delay)
+                    start = int(parse_qs(urlparse(self.path).query).get("start", ["0"])[0])
+                    page = start // JOBS_PER_PAGE
+                    body = (stub.pages[page] if page < len(stub.pages) else "<html><body></body></html>").encode()
+                    self.send_response(200)
+                    self.send_header("Content-Type", "text/html; charset=utf-8")
+                    self.send_header("Content-Length", str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                finally:
+                    with stub._lock:
+                        stub.in_flight -= 1
+
+            def log_message(self, format, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/jobs"
+        self._thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self) -> "StubIndeedServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+def check_stub_server(concurrency: int = MAX_CONCURRENT_PAGES) -> bool:
+    """
+    Fetch every recorded page from a StubIndeedServer, plus one past the end, and check
+    that the jobs come back complete and in page order, that pages were fetched
+    concurrently, and that the synchronous entry point also works from a running event loop.
+
+    Returns:
+        True if all checks pass
+    """
+    if not linkedin_scraper.HAS_HTTPX:
+        print("SKIP httpx is not installed; the sequential fetcher has no concurrency to check")
+        return True
+
+    ok = True
+
+    def check(passed: bool, message: str) -> None:
+        nonlocal ok
+        ok = ok and passed
+        print(f"{'OK  ' if passed else 'FAIL'} {message}")
+
+    with StubIndeedServer() as stub:
+        expected = [
+            job["title"]
+            for html in stub.pages
+            for job in (IndeedScraper()._parse_job_card(card) for card in select_job_cards(html))
+            if job
+        ]
+        # A generous budget, so only the concurrency limit holds requests back
+        limiter = RateLimiter(rate=1000, burst=100)
+        scraper = IndeedScraper(base_url=stub.url, concurrency=concurrency, rate_limiter=limiter)
+        params = scraper._build_search_params(["software", "engineer"], None)
+        # One page more than the fixtures hold, which the stub serves without job cards
+        limit = (len(stub.pages) + 1) * JOBS_PER_PAGE
+
+        started = time.perf_counter()
+        jobs = asyncio.run(scraper._fetch_pages_async(dict(params), limit))
+        elapsed = time.perf_counter() - started
+        check([job["title"] for job in jobs] == expected,
+              f"async fetcher returned {len(jobs)} of {len(expected)} jobs in page order")
+        check(1 < stub.peak_concurrency <= concurrency,
+              f"{stub.requests} page requests, at most {stub.peak_concurrency} at once "
+              f"(limit {concurrency}), in {elapsed:.2f}s")
+
+        async def fetch_from_event_loop() -> List[Dict[str, Any]]:
+            return scraper._fetch_jobs(dict(params), limit)
+
+        try:
+            jobs = asyncio.run(fetch_from_event_loop())
+            check([job["title"] for job in jobs] == expected, "_fetch_jobs works from a running event loop")
+        except RuntimeError as e:
+            check(False, f"_fetch_jobs failed from a running event loop: {e}")
+
+    return ok
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description="Check the concurrent fetcher of linkedin_scraper.py against recorded pages served locally"
+    )
+    parser.add_argument("--concurrency", type=int, default=MAX_CONCURRENT_PAGES, help="Pages in flight at once")
+    args = parser.parse_args()
+    return 0 if check_stub_server(args.concurrency) else 1
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,192 @@
+import queue
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from typing import Iterator, Optional
+import psycopg2
+import psycopg2.extensions
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+class PoolExhaustedError(Exception):
+    """Raised when no database connection becomes available before the checkout timeout."""
+
+class ConnectionPool:
+    def __init__(self, dsn: str, min_size: int = 1, max_size: int = 10, timeout: float = 10.0,
+                 health_check_interval: float = 30.0):
+        """
+        Thread-safe pool of PostgreSQL connections.
+
+        Connections are opened up to max_size on demand and kept open between
+        checkouts, so queries don't pay for a new TCP/TLS/auth handshake each time.
+        A connection that sat idle longer than health_check_interval is pinged
+        before it is handed out and replaced if the server dropped it.
+
+        Args:
+            dsn: PostgreSQL connection URL
+            min_size: Connections opened up front by open()
+            max_size: Maximum number of open connections
+            timeout: Default seconds to wait for a free connection when the pool is exhausted
+            health_check_interval: Idle seconds after which a connection is checked before use
+        """
+        self.dsn = dsn
+        self.max_size = max(1, max_size)
+        self.min_size = min(max(0, min_size), self.max_size)
+        self.timeout = timeout
+        self.health_check_interval = health_check_interval
+        # LIFO so the most recently used connection is handed out first and idle ones age out
+        self._idle = queue.LifoQueue()  # (connection, returned_at)
+        self._created = 0
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def _connect(self):
+        conn = psycopg2.connect(self.dsn)
+        conn.autocommit = False
+        return conn
+
+    def open(self) -> None:
+        """Open min_size connections, raising if the database can't be reached."""
+        while True:
+            with self._lock:
+                if self._created >= self.min_size:
+                    break
+                self._created += 1
+            try:
+                conn = self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+            self._idle.put((conn, time.monotonic()))
+
+        logger.info(f"Database connection pool opened with {self._created} connection(s)")
+
+    def _is_healthy(self, conn, returned_at: float) -> bool:
+        """Check an idle connection before handing it out"""
+        if conn.closed:
+            return False
+        if time.monotonic() - returned_at < self.health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error as e:
+            logger.warning(f"Dropping stale database connection: {e}")
+            return False
+
+    def _discard(self, conn) -> None:
+        try:
+            if not conn.closed:
+                conn.close()
+        except Exception as e:
+            logger.error(f"Error closing database connection: {e}")
+        with self._lock:
+            self._created -= 1
+
+    def _acquire(self, timeout: float):
+        """Take a healthy idle connection, open a new one if below max_size, or wait for one."""
+        if self._closed:
+            raise PoolExhaustedError("Database connection pool is closed")
+
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                conn, returned_at = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            if self._is_healthy(conn, returned_at):
+                return conn
+            self._discard(conn)
+
+        create = False
+        with self._lock:
+            if self._created < self.max_size:
+                self._created += 1
+                create = True
+
+        if create:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                raise PoolExhaustedError(f"No database connection available after {timeout} seconds")
+            try:
+                conn, returned_at = self._idle.get(timeout=remaining)
+            except queue.Empty:
+                continue
+            if self._is_healthy(conn, returned_at):
+                return conn
+            self._discard(conn)
+            # The broken connection freed a slot; open a replacement instead of waiting
+            return self._acquire(max(0.0, deadline - time.monotonic()))
+
+    def _release(self, conn, discard: bool = False) -> None:
+        """Return a connection to the pool, or close it if it is broken or the pool is closed."""
+        if discard or self._closed or conn.closed:
+            self._discard(conn)
+            return
+
+        try:
+            # Never hand out a connection with an open or failed transaction
+            if conn.get_transaction_status() != psycopg2.extensions.TRANSACTION_STATUS_IDLE:
+                conn.rollback()
+        except psycopg2.Error:
+            self._discard(conn)
+            return
+
+        self._idle.put((conn, time.monotonic()))
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None) -> Iterator[psycopg2.extensions.connection]:
+        """
+        Check out a connection for exclusive use.
+
+        Uncommitted work is rolled back when the connection is returned.
+
+        Args:
+            timeout: Seconds to wait for a free connection (defaults to the pool timeout)
+
+        Yields:
+            A connection that no other caller uses until it is returned
+
+        Raises:
+            PoolExhaustedError: If no connection becomes available in time
+        """
+        conn = self._acquire(self.timeout if timeout is None else timeout)
+        try:
+            yield conn
+        except BaseException as e:
+            # Connection-level failures leave the connection unusable; query errors don't
+            broken = conn.closed or isinstance(e, (psycopg2.OperationalError, psycopg2.InterfaceError))
+            self._release(conn, discard=broken)
+            raise
+        else:
+            self._release(conn)
+
+    def stats(self) -> dict:
+        """Number of open and idle connections"""
+        with self._lock:
+            return {"open": self._created, "idle": self._idle.qsize(), "max": self.max_size}
+
+    def close(self) -> None:
+        """Close all idle connections; checked-out connections are closed when returned."""
+        self._closed = True
+        while True:
+            try:
+                conn, _ = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(conn)
+        logger.info("Database connection pool closed")
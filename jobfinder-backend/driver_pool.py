@@ -0,0 +1,160 @@
+import queue
+import threading
+import logging
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+class PoolExhaustedError(Exception):
+    """Raised when no scraper becomes available before the checkout timeout."""
+
+class DriverPool:
+    def __init__(self, factory: Callable[[], Any], size: int = 2, timeout: float = 60.0):
+        """
+        Bounded pool of browser-backed scrapers.
+
+        Each pooled scraper owns one Chrome driver and its own browser session, so
+        concurrent searches never share a driver.
+
+        Args:
+            factory: Callable creating a new scraper
+            size: Maximum number of scrapers (and drivers) in the pool
+            timeout: Default seconds to wait for a free scraper when the pool is exhausted
+        """
+        self._factory = factory
+        self.size = max(1, size)
+        self.timeout = timeout
+        # LIFO so the most recently used, warmest scraper is handed out first
+        self._idle = queue.LifoQueue()
+        self._created = 0
+        # Scrapers handed out and not yet returned, so close(force=True) can quit their drivers
+        self._checked_out = set()
+        self._lock = threading.Lock()
+        self._closed = False
+
+    def warm(self) -> None:
+        """Create scrapers until the pool is full and start their drivers."""
+        while True:
+            with self._lock:
+                if self._created >= self.size:
+                    break
+                self._created += 1
+            try:
+                scraper = self._factory()
+                scraper.driver  # Start the browser now rather than on first checkout
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+            self._idle.put(scraper)
+
+        logger.info(f"Driver pool warmed with {self._created} driver(s)")
+
+    def _acquire(self, timeout: float) -> Any:
+        """Take an idle scraper, create a new one if below size, or wait for one to be returned."""
+        if self._closed:
+            raise PoolExhaustedError("Driver pool is closed")
+
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        create = False
+        with self._lock:
+            if self._created < self.size:
+                self._created += 1
+                create = True
+
+        if create:
+            try:
+                return self._factory()
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise PoolExhaustedError(f"No scraper available after {timeout} seconds")
+
+    def _discard(self, scraper: Any) -> None:
+        """Close a scraper and free its place in the pool."""
+        try:
+            scraper.close()
+        except Exception as e:
+            logger.error(f"Error closing scraper: {e}")
+        with self._lock:
+            self._created -= 1
+
+    def _release(self, scraper: Any, discard: bool = False) -> None:
+        """Return a scraper to the pool, or close it if it is broken or the pool is closed."""
+        with self._lock:
+            if scraper not in self._checked_out:
+                # Already closed by close(force=True)
+                return
+            self._checked_out.remove(scraper)
+
+        if discard or self._closed:
+            self._discard(scraper)
+            return
+
+        self._idle.put(scraper)
+
+    @contextmanager
+    def checkout(self, timeout: Optional[float] = None) -> Iterator[Any]:
+        """
+        Check out a scraper for exclusive use.
+
+        Args:
+            timeout: Seconds to wait for a free scraper (defaults to the pool timeout)
+
+        Yields:
+            A scraper that no other caller uses until it is returned
+
+        Raises:
+            PoolExhaustedError: If no scraper becomes available in time
+        """
+        scraper = self._acquire(self.timeout if timeout is None else timeout)
+        with self._lock:
+            self._checked_out.add(scraper)
+        try:
+            yield scraper
+        except Exception:
+            # The driver may be in an unknown state; replace it on the next checkout
+            self._release(scraper, discard=True)
+            raise
+        except GeneratorExit:
+            # A streaming caller stopped reading between pages; the driver is still usable
+            self._release(scraper)
+            raise
+        else:
+            self._release(scraper)
+
+    def close(self, force: bool = False) -> None:
+        """
+        Close all idle scrapers. Checked-out scrapers are closed when returned, or right
+        away with force, which makes the scrapes using them fail.
+
+        Args:
+            force: Also close scrapers that are checked out
+        """
+        self._closed = True
+        while True:
+            try:
+                scraper = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._discard(scraper)
+
+        if force:
+            with self._lock:
+                busy = list(self._checked_out)
+                self._checked_out.clear()
+            for scraper in busy:
+                self._discard(scraper)
+        logger.info("Driver pool closed")
@@ -1,5 +1,4 @@
 import requests
-from bs4 import BeautifulSoup
 import re
 import json
 import time
@@ -25,11 +24,22 @@ except ImportError:
     UserAgent = SimpleUserAgent
 
 import logging
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterator, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import os
-import undetected_chromedriver as uc
-from database import get_jobs, initialize_database, update_user_preferences, save_job_for_user, unsave_job_for_user, get_saved_jobs, create_user as db_create_user, get_user_by_email, update_last_login
+import threading
+# Try to import undetected-chromedriver, but allow parsing recorded pages without it (e.g. benchmarks)
+try:
+    import undetected_chromedriver as uc
+    HAS_UC = True
+except ImportError:
+    HAS_UC = False
+from driver_pool import DriverPool
+from rate_limiter import get_rate_limiter
+from search_cache import get_cache, normalize_query
+from job_parser import select_job_cards
+from metrics import scrape_stage
+from database import get_jobs, upsert_jobs, initialize_database, update_user_preferences, save_job_for_user, unsave_job_for_user, get_saved_jobs, create_user as db_create_user, get_user_by_email, update_last_login
 import psycopg2
 
 # Configure logging
@@ -38,8 +48,22 @@ logger = logging.getLogger(__name__)
 
 # Constants
 INDEED_JOB_URL = "https://www.indeed.com/jobs"
+INDEED_HOME_URL = "https://www.indeed.com/"
+INDEED_HOST = "www.indeed.com"
 DEFAULT_LIMIT = 25
 USE_MOCK_DATA = False  # Set to False to use real data
+DRIVER_POOL_SIZE = int(os.getenv("DRIVER_POOL_SIZE", "2"))  # Chrome drivers per process
+DRIVER_POOL_TIMEOUT = float(os.getenv("DRIVER_POOL_TIMEOUT", "60"))  # seconds to wait for a free driver
+SESSION_MAX_AGE = int(os.getenv("SESSION_MAX_AGE", "1800"))  # seconds before a warmed-up session is refreshed
+
+# Markers of bot-check pages served instead of results
+CHALLENGE_PAGE_MARKERS = [
+    "<title>just a moment", "cf-challenge", "challenge-platform", "hcaptcha",
+    "verify you are human", "<title>security check", "additional verification required"
+]
+
+# Markers of a real search with no matching jobs
+NO_RESULTS_MARKERS = ["did not match any jobs", "jobsearch-noresult"]
 
 # Dictionary of search terms by category
 SEARCH_TERM_DICT = {
@@ -61,24 +85,78 @@ SEARCH_TERM_DICT = {
     "senior": ["senior", "lead", "principal", "staff", "manager", "director", "head", "chief", "vp", "executive"]
 }
 
+# Indeed URL filters for the job types and experience levels stored in the jobs table
+INDEED_JOB_TYPES = {
+    "Full-time": "fulltime", "Part-time": "parttime", "Contract": "contract", "Internship": "internship"
+}
+INDEED_EXPERIENCE_LEVELS = {"Junior": "ENTRY_LEVEL", "Mid-level": "MID_LEVEL", "Senior": "SENIOR_LEVEL"}
+
+# Skills looked for in job descriptions
+COMMON_SKILLS = {
+    "python": "Python", "javascript": "JavaScript", "js": "JavaScript",
+    "react": "React", "node": "Node.js", "angular": "Angular", "vue": "Vue.js",
+    "java": "Java", "c#": "C#", ".net": ".NET", "sql": "SQL", 
+    "aws": "AWS", "azure": "Azure", "cloud": "Cloud Computing",
+    "docker": "Docker", "kubernetes": "Kubernetes", "git": "Git",
+    "html": "HTML", "css": "CSS", "typescript": "TypeScript",
+    "agile": "Agile", "scrum": "Scrum", "jira": "Jira"
+}
+
+def determine_job_type(title: str, description: str) -> str:
+    """Determine job type from title and description"""
+    title_lower = title.lower()
+    desc_lower = description.lower()
+    if any(term in desc_lower or term in title_lower for term in ["part-time", "part time"]):
+        return "Part-time"
+    elif any(term in desc_lower or term in title_lower for term in ["contract", "contractor"]):
+        return "Contract"
+    elif any(term in desc_lower or term in title_lower for term in ["intern", "internship"]):
+        return "Internship"
+    return "Full-time"
+
+def determine_experience_level(title: str) -> str:
+    """Determine experience level from title"""
+    title_lower = title.lower()
+    if any(term in title_lower for term in ["senior", "sr", "lead", "principal"]):
+        return "Senior"
+    elif any(term in title_lower for term in ["junior", "jr", "entry", "associate"]):
+        return "Junior"
+    return "Mid-level"
+
+def extract_skills_from_description(description: str) -> List[str]:
+    """Extract up to five known skills mentioned in a job description"""
+    desc_lower = description.lower()
+    skills = [skill for key, skill in COMMON_SKILLS.items() if key in desc_lower]
+    return skills[:5]
+
+def create_driver():
+    """
+    Create an undetected Chrome driver (visible Chrome, realistic fingerprinting)
+    Note: Requires undetected-chromedriver to be installed.
+    """
+    if not HAS_UC:
+        raise RuntimeError("undetected-chromedriver is required to scrape Indeed with Chrome")
+    chrome_options = uc.ChromeOptions()
+    chrome_options.headless = False  # Run in visible mode
+    chrome_options.add_argument('--disable-gpu')
+    chrome_options.add_argument('--no-sandbox')
+    chrome_options.add_argument('--window-size=1920,1080')
+    chrome_options.add_argument('--lang=en-US,en')
+    chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36")
+    return uc.Chrome(options=chrome_options)
+
 class IndeedScraper:
     def __init__(self, use_proxy=False):
         """
-        Initialize the Indeed scraper using undetected-chromedriver (visible Chrome, realistic fingerprinting)
-        Note: Requires undetected-chromedriver to be installed.
+        Initialize the Indeed scraper. The Chrome driver is started on first use.
         """
         self.use_proxy = use_proxy
-        self.last_request_time = 0
-        self.min_request_interval = 2  # seconds between requests
-        # Set up undetected Chrome
-        chrome_options = uc.ChromeOptions()
-        chrome_options.headless = False  # Run in visible mode
-        chrome_options.add_argument('--disable-gpu')
-        chrome_options.add_argument('--no-sandbox')
-        chrome_options.add_argument('--window-size=1920,1080')
-        chrome_options.add_argument('--lang=en-US,en')
-        chrome_options.add_argument("user-agent=Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/113.0.0.0 Safari/537.36")
-        self.driver = uc.Chrome(options=chrome_options)
+        # Request budget shared with every other scraper using the same rate limiter backend
+        self.rate_limiter = get_rate_limiter()
+        self._driver = None
+        # Browser session state; the homepage is loaded once per driver, not per page
+        self.session_warm = False
+        self.session_warmed_at = 0
 
         # Placeholder for cookie injection
         # To use: log in to Indeed in a real browser, export cookies as a list of dicts, and paste below
@@ -88,17 +166,78 @@ class IndeedScraper:
             # {"name": "session", "value": "your_session_cookie", "domain": ".indeed.com", ...}
         ]
 
+    @property
+    def driver(self):
+        """Chrome driver owned by this scraper, started lazily"""
+        if self._driver is None:
+            self._driver = create_driver()
+        return self._driver
+
+    def close(self):
+        """Quit the Chrome driver if it was started"""
+        if self._driver is not None:
+            try:
+                self._driver.quit()
+            finally:
+                self._driver = None
+                self.session_warm = False
+
+    def _warm_session(self):
+        """Open the Indeed homepage once per driver to pick up cookies, injecting ours if enabled"""
+        self._throttle_request()
+        logger.info("Warming browser session on the Indeed homepage")
+        with scrape_stage("selenium", "warm_session"):
+            self.driver.get(INDEED_HOME_URL)
+        # Inject cookies if enabled
+        if self.inject_cookies and self.cookies:
+            for cookie in self.cookies:
+                self.driver.add_cookie(cookie)
+        self.session_warm = True
+        self.session_warmed_at = time.time()
+
+    def _session_valid(self) -> bool:
+        """Whether the warmed-up session can still be used for result pages"""
+        return self.session_warm and time.time() - self.session_warmed_at < SESSION_MAX_AGE
+
+    def _load_page(self, url: str) -> str:
+        """Load a result page in the warmed-up session and return its HTML"""
+        if not self._session_valid():
+            self._warm_session()
+        with scrape_stage("selenium", "driver_get"):
+            self.driver.get(url)
+        with scrape_stage("selenium", "scroll_wait"):
+            # Wait randomly to mimic human behavior
+            wait_time = random.uniform(0.5, 1.0)
+            logger.debug(f"Waiting {wait_time:.2f} seconds after page load")
+            time.sleep(wait_time)
+            # Scroll the page to bottom to trigger dynamic loading
+            self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            time.sleep(random.uniform(0.2, 0.5))
+        with scrape_stage("selenium", "page_source"):
+            html = self.driver.page_source
+        logger.debug(f"HTML response (Selenium):\n{html[:2000]}\n---END OF HTML---")
+        return html
+
+    def _is_challenge_page(self, html: str) -> bool:
+        """Detect bot-check pages served instead of search results"""
+        html_lower = html.lower()
+        return any(marker in html_lower for marker in CHALLENGE_PAGE_MARKERS)
+
+    def _is_no_results_page(self, html: str) -> bool:
+        """Detect a genuine "no jobs matched" page, which needs no re-warm"""
+        html_lower = html.lower()
+        return any(marker in html_lower for marker in NO_RESULTS_MARKERS)
+
     def _throttle_request(self):
         """Throttle requests to avoid rate limiting"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
+        with scrape_stage("selenium", "throttle"):
+            self.rate_limiter.acquire(INDEED_HOST)
 
     def search_jobs(self, keywords: Optional[List[str]] = None, 
                    location: Optional[str] = None,
                    categories: Optional[List[str]] = None,  # keep for interface compatibility
-                   limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+                   limit: int = DEFAULT_LIMIT,
+                   filters: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
         """
         Search for jobs on Indeed
         
@@ -107,10 +246,49 @@ class IndeedScraper:
             location: Location to search in
             categories: (ignored)
             limit: Maximum number of jobs to return
+            filters: job_type and experience_level to filter by on Indeed
             
         Returns:
             List of job listings as dictionaries
         """
+        # Perform the search
+        return list(self.iter_jobs(keywords, location, categories, limit, filters))
+
+    def iter_jobs(self, keywords: Optional[List[str]] = None,
+                  location: Optional[str] = None,
+                  categories: Optional[List[str]] = None,  # keep for interface compatibility
+                  limit: int = DEFAULT_LIMIT,
+                  filters: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Search for jobs on Indeed, yielding each job as soon as its result page is parsed
+        and stored, instead of waiting for the last page
+
+        Args:
+            keywords: List of specific keywords to search for
+            location: Location to search in
+            categories: (ignored)
+            limit: Maximum number of jobs to yield
+            filters: job_type and experience_level to filter by on Indeed; values without an
+                     Indeed filter (see INDEED_JOB_TYPES, INDEED_EXPERIENCE_LEVELS) are ignored
+
+        Yields:
+            Job listings as dictionaries, with db_id set to the jobs table id
+        """
+        params = self._build_search_params(keywords, location)
+        # Jobs from a filtered search are known to have the filtered values, which beats
+        # guessing them from the card text
+        known = {}
+        if filters:
+            if filters.get("job_type") in INDEED_JOB_TYPES:
+                params["jt"] = INDEED_JOB_TYPES[filters["job_type"]]
+                known["job_type"] = filters["job_type"]
+            if filters.get("experience_level") in INDEED_EXPERIENCE_LEVELS:
+                params["explvl"] = INDEED_EXPERIENCE_LEVELS[filters["experience_level"]]
+                known["experience_level"] = filters["experience_level"]
+        return self._iter_fetch_jobs(params, limit, known)
+
+    def _build_search_params(self, keywords: Optional[List[str]], location: Optional[str]) -> Dict[str, Any]:
+        """Build the Indeed query parameters for a search"""
         # Construct the search query for Indeed
         search_query = ' '.join(keywords) if keywords and keywords[0] else ''
         
@@ -134,75 +312,79 @@ class IndeedScraper:
             "newcount": "207",
             "fromage": "last"
         }
-                    
-        # Perform the search
-        return self._fetch_jobs(params, limit)
+        return params
     
-    def _fetch_jobs(self, params: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
-        jobs = []
+    def _iter_fetch_jobs(self, params: Dict[str, Any], limit: int,
+                         known: Optional[Dict[str, str]] = None) -> Iterator[Dict[str, Any]]:
+        count = 0
         page = 0
         jobs_per_page = 15  # Indeed typically shows 15 jobs per page
         start_val = 0
         base_url = INDEED_JOB_URL
         from urllib.parse import urlencode
-        while len(jobs) < limit:
+        retried_page = False
+        while count < limit:
             if page > 0:
                 params["start"] = str(start_val)
             self._throttle_request()
             url = f"{base_url}?{urlencode(params)}"
             logger.info(f"Selenium requesting URL: {url}")
-            print(f"Requesting URL: {url}")
             try:
-                self.driver.get("https://www.indeed.com/")  # Open homepage first for cookies
-                # Inject cookies if enabled
-                if self.inject_cookies and self.cookies:
-                    for cookie in self.cookies:
-                        self.driver.add_cookie(cookie)
-                    self.driver.get(url)  # Reload after setting cookies
-                else:
-                    self.driver.get(url)
-                # Wait randomly to mimic human behavior
-                wait_time = random.uniform(0.5, 1.0)
-                print(f"[DEBUG] Waiting {wait_time:.2f} seconds after page load...")
-                time.sleep(wait_time)
-                # Scroll the page to bottom to trigger dynamic loading
-                self.driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(random.uniform(0.2, 0.5))
-                html = self.driver.page_source
-                print(f"HTML response (Selenium):\n{html[:2000]}\n---END OF HTML---")
-                soup = BeautifulSoup(html, 'html.parser')
-                job_cards = soup.select('div.job_seen_beacon')
+                html = self._load_page(url)
+                with scrape_stage("selenium", "parse"):
+                    job_cards = select_job_cards(html)
                 logger.info(f"Found {len(job_cards)} job cards on page {page+1}")
                 if not job_cards:
-                    logger.warning("No job cards found on page")
-                    break
+                    if self._is_no_results_page(html):
+                        logger.info("Reached the end of the search results")
+                        break
+                    if retried_page:
+                        logger.warning("No job cards found on page")
+                        break
+                    # Challenge or empty page: the session is probably no longer valid,
+                    # so warm it up again and retry this page once
+                    reason = "challenge page" if self._is_challenge_page(html) else "no job cards"
+                    logger.warning(f"Got {reason} on page {page+1}, re-warming browser session")
+                    self.session_warm = False
+                    retried_page = True
+                    continue
+                retried_page = False
+                page_jobs = []
                 for card in job_cards:
-                    job = self._parse_job_card(card)
+                    with scrape_stage("selenium", "parse_job_card"):
+                        job = self._parse_job_card(card)
                     if job:
-                        # Save job to DB
-                        insert_job(job)
-                        jobs.append(job)
-                    if len(jobs) >= limit:
+                        job.update(known or {})
+                        page_jobs.append(job)
+                    if count + len(page_jobs) >= limit:
                         break
-                page += 1
-                start_val += jobs_per_page
-                time.sleep(random.uniform(0.2, 0.5))
+                # Save the page's jobs to DB in one batch
+                with scrape_stage("selenium", "upsert"):
+                    upsert_jobs(page_jobs)
             except Exception as e:
                 logger.error(f"Error fetching jobs with Selenium: {e}")
+                # Don't trust the session after a driver error
+                self.session_warm = False
                 break
-        logger.info(f"Returning {len(jobs)} jobs (limit was {limit})")
-        return jobs[:limit]
+            # Hand the page's jobs to the caller before loading the next page
+            for job in page_jobs:
+                yield job
+            count += len(page_jobs)
+            page += 1
+            start_val += jobs_per_page
+            time.sleep(random.uniform(0.2, 0.5))
     
     def _parse_job_card(self, card) -> Optional[Dict[str, Any]]:
         """
         Parse a job card from Indeed
         Args:
-            card: BeautifulSoup element for the job card
+            card: Job card element from job_parser.select_job_cards
         Returns:
             Job information as a dictionary or None if parsing failed
         """
         try:
-            print("\n[DEBUG] Job card HTML:\n", card.prettify()[:1000], "\n---END OF CARD---\n")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Job card HTML:\n{str(card)[:1000]}\n---END OF CARD---")
 
             job_id = card.get('data-jk', '')
             if not job_id:
@@ -288,35 +470,9 @@ class IndeedScraper:
                 else:
                     salary_range = "$80,000 - $120,000"
 
-            job_type = "Full-time"
-            if any(term in description.lower() or term in title.lower() for term in ["part-time", "part time"]):
-                job_type = "Part-time"
-            elif any(term in description.lower() or term in title.lower() for term in ["contract", "contractor"]):
-                job_type = "Contract"
-            elif any(term in description.lower() or term in title.lower() for term in ["intern", "internship"]):
-                job_type = "Internship"
-
-            experience_level = "Mid-level"
-            if any(term in title.lower() for term in ["senior", "sr", "lead", "principal"]):
-                experience_level = "Senior"
-            elif any(term in title.lower() for term in ["junior", "jr", "entry", "associate"]):
-                experience_level = "Junior"
-
-            skills = []
-            common_skills = {
-                "python": "Python", "javascript": "JavaScript", "js": "JavaScript",
-                "react": "React", "node": "Node.js", "angular": "Angular", "vue": "Vue.js",
-                "java": "Java", "c#": "C#", ".net": ".NET", "sql": "SQL", 
-                "aws": "AWS", "azure": "Azure", "cloud": "Cloud Computing",
-                "docker": "Docker", "kubernetes": "Kubernetes", "git": "Git",
-                "html": "HTML", "css": "CSS", "typescript": "TypeScript",
-                "agile": "Agile", "scrum": "Scrum", "jira": "Jira"
-            }
-            desc_lower = description.lower()
-            for key, skill in common_skills.items():
-                if key in desc_lower:
-                    skills.append(skill)
-            skills = skills[:5]
+            job_type = determine_job_type(title, description)
+            experience_level = determine_experience_level(title)
+            skills = extract_skills_from_description(description)
 
             return {
                 "id": job_id,
@@ -335,20 +491,62 @@ class IndeedScraper:
             logger.error(f"Error parsing job card: {e}")
             return None
 
-# Singleton instance
-_scraper = None
+# Shared pool of scrapers, each with its own Chrome driver
+_pool = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> DriverPool:
+    """Get or create the shared scraper pool, starting its drivers up front"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = DriverPool(IndeedScraper, size=DRIVER_POOL_SIZE, timeout=DRIVER_POOL_TIMEOUT)
+            try:
+                _pool.warm()
+            except Exception as e:
+                # Drivers that failed to start are created again on checkout
+                logger.error(f"Error warming driver pool: {e}")
+    return _pool
+
+def close_pool(force: bool = True) -> None:
+    """
+    Quit the Chrome drivers of the shared scraper pool, if it was created.
 
-def get_scraper() -> IndeedScraper:
-    """Get or create singleton scraper instance"""
-    global _scraper
-    if _scraper is None:
-        _scraper = IndeedScraper()
-    return _scraper
+    Args:
+        force: Also quit drivers in use by running scrapes, which then fail
+    """
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.close(force=force)
 
-def search_jobs(keywords=None, location=None, categories=None, limit=DEFAULT_LIMIT):
-    """Convenience function to search jobs"""
-    scraper = get_scraper()
-    return scraper.search_jobs(keywords, location, categories, limit)
+def search_jobs(keywords=None, location=None, categories=None, limit=DEFAULT_LIMIT, filters=None):
+    """Convenience function to search jobs, served from the search cache when fresh"""
+    return list(stream_jobs(keywords, location, categories, limit, filters))
+
+def stream_jobs(keywords=None, location=None, categories=None, limit=DEFAULT_LIMIT, filters=None) -> Iterator[Dict[str, Any]]:
+    """
+    Search jobs, yielding each job as soon as its result page has been parsed.
+    Served from the search cache when fresh; a scrape that runs to completion is cached.
+    """
+    cache = get_cache()
+    key = normalize_query(keywords, location, categories, limit, filters)
+    jobs = cache.get(key)
+    if jobs is not None:
+        logger.info(f"Search cache hit for {key}")
+        yield from jobs
+        return
+
+    jobs = []
+    with get_pool().checkout() as scraper:
+        for job in scraper.iter_jobs(keywords, location, categories, limit, filters):
+            jobs.append(job)
+            yield job
+
+    # Don't cache failed or empty scrapes so the next search tries again
+    if jobs:
+        cache.set(key, jobs)
 
 # For testing
 if __name__ == "__main__":
@@ -363,48 +561,4 @@ if __name__ == "__main__":
 # Add this function to insert a job into the jobs table if it doesn't already exist
 def insert_job(job: dict):
     """Insert a job into the jobs table if it doesn't already exist (by title, company, location)."""
-    from database import get_db_connection
-    conn = None
-    try:
-        conn, cur = get_db_connection()
-        if conn is None:
-            return None
-        # Check if job already exists
-        cur.execute(
-            "SELECT id FROM jobs WHERE title = %s AND company = %s AND location = %s",
-            (job["title"], job["company"], job["location"])
-        )
-        existing = cur.fetchone()
-        if existing:
-            return existing["id"]
-        # Insert new job (now includes link)
-        cur.execute(
-            """
-            INSERT INTO jobs (title, company, location, description, salary_range, job_type, experience_level, skills, posted_at, link)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-            RETURNING id
-            """,
-            (
-                job["title"],
-                job["company"],
-                job["location"],
-                job["description"],
-                job["salary_range"],
-                job["job_type"],
-                job["experience_level"],
-                job["skills"],
-                job["posted_at"],
-                job["link"]
-            )
-        )
-        job_id = cur.fetchone()["id"]
-        conn.commit()
-        return job_id
-    except Exception as e:
-        print(f"[ERROR] Failed to insert job: {e}")
-        if conn:
-            conn.rollback()
-        return None
-    finally:
-        if conn and not conn.closed:
-            conn.close() 
\ No newline at end of file
+    return upsert_jobs([job])[0]
@@ -0,0 +1,256 @@
+import os
+import sys
+import json
+import glob
+import random
+import logging
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Any
+from bs4 import BeautifulSoup
+
+# Try to import the fast parser backends, but fall back to BeautifulSoup if they're not available
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except ImportError:
+    HAS_SELECTOLAX = False
+
+try:
+    import lxml.html
+    from lxml import etree
+    from lxml.cssselect import CSSSelector
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Parser backend: "auto" picks the fastest installed one (selectolax, then lxml, then bs4)
+PARSER_ENGINE = os.getenv("PARSER_ENGINE", "auto").lower()
+
+# CSS selector matching one job card on an Indeed result page
+JOB_CARD_SELECTOR = "div.job_seen_beacon"
+
+# Recorded result pages used to check that every backend parses identically
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "indeed")
+
+# Text inside these elements is not part of an element's text, matching BeautifulSoup
+NON_TEXT_TAGS = ["script", "style"]
+
+class LxmlNode:
+    """
+    lxml element exposing the subset of the BeautifulSoup Tag API used by the
+    scrapers' _parse_job_card methods.
+    """
+    __slots__ = ("_el",)
+
+    def __init__(self, el):
+        self._el = el
+
+    def get(self, name: str, default: Any = None) -> Any:
+        return self._el.get(name, default)
+
+    def has_attr(self, name: str) -> bool:
+        return name in self._el.attrib
+
+    def __getitem__(self, name: str) -> str:
+        return self._el.attrib[name]
+
+    def select_one(self, selector: str) -> Optional["LxmlNode"]:
+        matches = _lxml_selector(selector)(self._el)
+        return LxmlNode(matches[0]) if matches else None
+
+    def select(self, selector: str) -> List["LxmlNode"]:
+        return [LxmlNode(el) for el in _lxml_selector(selector)(self._el)]
+
+    @property
+    def text(self) -> str:
+        return self._el.text_content()
+
+    def get_text(self, strip: bool = False) -> str:
+        if strip:
+            return "".join(part.strip() for part in self._el.itertext())
+        return self._el.text_content()
+
+    def __str__(self) -> str:
+        return etree.tostring(self._el, encoding="unicode", method="html")
+
+class SelectolaxNode:
+    """
+    selectolax node exposing the subset of the BeautifulSoup Tag API used by the
+    scrapers' _parse_job_card methods.
+    """
+    __slots__ = ("_node",)
+
+    def __init__(self, node):
+        self._node = node
+
+    def get(self, name: str, default: Any = None) -> Any:
+        attributes = self._node.attributes
+        if name not in attributes:
+            return default
+        # Valueless attributes are reported as None; BeautifulSoup reports ""
+        value = attributes[name]
+        return "" if value is None else value
+
+    def has_attr(self, name: str) -> bool:
+        return name in self._node.attributes
+
+    def __getitem__(self, name: str) -> str:
+        value = self._node.attributes[name]
+        return "" if value is None else value
+
+    def select_one(self, selector: str) -> Optional["SelectolaxNode"]:
+        node = self._node.css_first(selector)
+        return SelectolaxNode(node) if node is not None else None
+
+    def select(self, selector: str) -> List["SelectolaxNode"]:
+        return [SelectolaxNode(node) for node in self._node.css(selector)]
+
+    @property
+    def text(self) -> str:
+        return self._node.text(deep=True)
+
+    def get_text(self, strip: bool = False) -> str:
+        return self._node.text(deep=True, strip=strip)
+
+    def __str__(self) -> str:
+        return self._node.html
+
+@lru_cache(maxsize=128)
+def _lxml_selector(selector: str):
+    """Compile a CSS selector to XPath once and reuse it"""
+    return CSSSelector(selector)
+
+def _select_cards_bs4(html: str, selector: str) -> List[Any]:
+    soup = BeautifulSoup(html, 'html.parser')
+    return soup.select(selector)
+
+def _select_cards_lxml(html: str, selector: str) -> List[LxmlNode]:
+    doc = lxml.html.fromstring(html)
+    etree.strip_elements(doc, *NON_TEXT_TAGS, with_tail=False)
+    return [LxmlNode(el) for el in _lxml_selector(selector)(doc)]
+
+def _select_cards_selectolax(html: str, selector: str) -> List[SelectolaxNode]:
+    tree = LexborHTMLParser(html)
+    tree.strip_tags(NON_TEXT_TAGS)
+    return [SelectolaxNode(node) for node in tree.css(selector)]
+
+ENGINES = {
+    "bs4": _select_cards_bs4,
+    "lxml": _select_cards_lxml,
+    "selectolax": _select_cards_selectolax,
+}
+
+def available_engines() -> List[str]:
+    """Parser backends that can be used in this environment"""
+    engines = ["bs4"]
+    if HAS_LXML:
+        engines.append("lxml")
+    if HAS_SELECTOLAX:
+        engines.append("selectolax")
+    return engines
+
+def resolve_engine(engine: Optional[str] = None) -> str:
+    """
+    Pick the parser backend to use.
+
+    Args:
+        engine: Requested backend name; defaults to PARSER_ENGINE
+
+    Returns:
+        Name of an installed backend, falling back to bs4
+    """
+    engine = (engine or PARSER_ENGINE).lower()
+    installed = available_engines()
+
+    if engine == "auto":
+        return installed[-1]
+    if engine not in installed:
+        logger.warning(f"Parser engine '{engine}' is not available, using bs4")
+        return "bs4"
+    return engine
+
+def select_job_cards(html: str, engine: Optional[str] = None, selector: str = JOB_CARD_SELECTOR) -> List[Any]:
+    """
+    Parse a result page and return its job card elements.
+
+    Every backend returns elements supporting get, has_attr, [], select_one,
+    select, text and get_text(strip=True) like BeautifulSoup tags, so the
+    scrapers' _parse_job_card methods work unchanged on any of them.
+
+    Args:
+        html: Page HTML
+        engine: Parser backend (bs4, lxml, selectolax or auto); defaults to PARSER_ENGINE
+        selector: CSS selector matching one job card
+
+    Returns:
+        List of job card elements
+    """
+    return ENGINES[resolve_engine(engine)](html, selector)
+
+class _FixedDatetime(datetime):
+    """datetime whose now() is constant, so cards without a date parse identically on every run"""
+    @classmethod
+    def now(cls, tz=None):
+        return cls(2024, 1, 1, tzinfo=tz)
+
+def _parse_fixture(path: str, engine: str) -> Dict[str, List[Dict[str, Any]]]:
+    """Parse a fixture page with both scrapers' _parse_job_card using one engine"""
+    import indeed_scraper
+    import linkedin_scraper
+
+    with open(path, encoding="utf-8") as f:
+        html = f.read()
+
+    results = {}
+    for module in (indeed_scraper, linkedin_scraper):
+        scraper = module.IndeedScraper()
+        # Fallback values in linkedin_scraper are random; seed so every engine sees the same ones
+        random.seed(0)
+        module.datetime = _FixedDatetime
+        try:
+            results[module.__name__] = [scraper._parse_job_card(card) for card in select_job_cards(html, engine)]
+        finally:
+            module.datetime = datetime
+    return results
+
+def check_parity(fixtures_dir: str = FIXTURES_DIR) -> bool:
+    """
+    Check that every installed backend produces the same job dicts as bs4 on the fixture pages.
+
+    Returns:
+        True if all backends agree
+    """
+    paths = sorted(glob.glob(os.path.join(fixtures_dir, "*.html")))
+    if not paths:
+        logger.error(f"No fixture pages found in {fixtures_dir}")
+        return False
+
+    ok = True
+    for path in paths:
+        expected = _parse_fixture(path, "bs4")
+        for engine in available_engines()[1:]:
+            actual = _parse_fixture(path, engine)
+            for scraper_name, jobs in expected.items():
+                if actual[scraper_name] == jobs:
+                    print(f"OK   {engine:<10} {scraper_name:<16} {os.path.basename(path)} ({len(jobs)} cards)")
+                    continue
+                ok = False
+                print(f"FAIL {engine:<10} {scraper_name:<16} {os.path.basename(path)}")
+                for want, got in zip(jobs, actual[scraper_name]):
+                    if want != got:
+                        print(f"  expected: {json.dumps(want)}\n  actual:   {json.dumps(got)}")
+                        break
+                if len(jobs) != len(actual[scraper_name]):
+                    print(f"  expected {len(jobs)} cards, got {len(actual[scraper_name])}")
+    return ok
+
+# For testing
+if __name__ == "__main__":
+    # Compare every installed parser backend against BeautifulSoup on the recorded pages
+    print(f"Installed parser engines: {', '.join(available_engines())}")
+    sys.exit(0 if check_parity() else 1)
@@ -1,5 +1,4 @@
 import requests
-from bs4 import BeautifulSoup
 import re
 import json
 import time
@@ -28,6 +27,18 @@ import logging
 from typing import Dict, List, Optional, Any, Tuple
 from datetime import datetime, timedelta
 import os
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+from job_parser import select_job_cards
+from metrics import scrape_stage
+from rate_limiter import RateLimiter, get_rate_limiter
+# Try to import httpx for concurrent page fetching, but fall back to sequential requests
+try:
+    import httpx
+    HAS_HTTPX = True
+except ImportError:
+    HAS_HTTPX = False
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
@@ -37,6 +48,9 @@ logger = logging.getLogger(__name__)
 INDEED_JOB_URL = "https://www.indeed.com/jobs"
 DEFAULT_LIMIT = 25
 USE_MOCK_DATA = True  # Set to True to use mock data only
+JOBS_PER_PAGE = 15  # Indeed typically shows 15 jobs per page
+MAX_CONCURRENT_PAGES = int(os.getenv("SCRAPER_CONCURRENCY", "4"))  # result pages fetched at once
+REQUEST_TIMEOUT = 20  # seconds per page request
 
 # Dictionary of search terms by category
 SEARCH_TERM_DICT = {
@@ -401,18 +415,25 @@ def generate_recent_date():
     return date.isoformat()
 
 class IndeedScraper:
-    def __init__(self, use_proxy=False):
+    def __init__(self, use_proxy=False, base_url: str = INDEED_JOB_URL,
+                 concurrency: int = MAX_CONCURRENT_PAGES,
+                 rate_limiter: Optional[RateLimiter] = None):
         """
         Initialize the Indeed scraper
         
         Args:
             use_proxy: Whether to use proxies for requests (not implemented yet)
+            base_url: Search URL to fetch result pages from (e.g. a local stub server)
+            concurrency: Maximum number of result pages fetched at the same time
+            rate_limiter: Per-host request budget (defaults to the one shared by all scrapers)
         """
         self.session = requests.Session()
         self.ua = UserAgent()
         self.use_proxy = use_proxy
-        self.last_request_time = 0
-        self.min_request_interval = 2  # seconds between requests
+        self.base_url = base_url
+        self.concurrency = max(1, concurrency)
+        self.rate_limiter = rate_limiter or get_rate_limiter()
+        self.host = urlparse(base_url).netloc
         
     def _get_random_header(self) -> Dict[str, str]:
         """
@@ -435,10 +456,13 @@ class IndeedScraper:
     
     def _throttle_request(self):
         """Throttle requests to avoid rate limiting"""
-        elapsed = time.time() - self.last_request_time
-        if elapsed < self.min_request_interval:
-            time.sleep(self.min_request_interval - elapsed)
-        self.last_request_time = time.time()
+        with scrape_stage("requests", "throttle"):
+            self.rate_limiter.acquire(self.host)
+    
+    async def _throttle_request_async(self):
+        """Wait for a token from the host's request budget without blocking the event loop"""
+        with scrape_stage("requests", "throttle"):
+            await self.rate_limiter.acquire_async(self.host)
     
     def search_jobs(self, keywords: Optional[List[str]] = None, 
                    location: Optional[str] = None,
@@ -483,6 +507,43 @@ class IndeedScraper:
                 
             return generate_mock_jobs(search_terms, location, limit)
         
+        # Perform the search
+        params = self._build_search_params(keywords, location, categories)
+        return self._fetch_jobs(params, limit)
+    
+    async def search_jobs_async(self, keywords: Optional[List[str]] = None, 
+                                location: Optional[str] = None,
+                                categories: Optional[List[str]] = None,
+                                limit: int = DEFAULT_LIMIT) -> List[Dict[str, Any]]:
+        """
+        Search for jobs on Indeed from a running event loop, fetching result pages concurrently
+        
+        Args:
+            keywords: List of specific keywords to search for
+            location: Location to search in
+            categories: List of categories from SEARCH_TERM_DICT to include
+            limit: Maximum number of jobs to return
+            
+        Returns:
+            List of job listings as dictionaries
+        """
+        # Mock data involves no I/O
+        if USE_MOCK_DATA or not HAS_HTTPX:
+            return await asyncio.to_thread(self.search_jobs, keywords, location, categories, limit)
+        
+        params = self._build_search_params(keywords, location, categories)
+        jobs = await self._fetch_pages_async(params, limit)
+        return jobs or self._mock_fallback(params, limit)
+    
+    def _build_search_params(self, keywords: Optional[List[str]] = None,
+                             location: Optional[str] = None,
+                             categories: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Build Indeed query parameters from keywords, location and categories
+        
+        Returns:
+            Dictionary of query parameters for the Indeed search URL
+        """
         # Construct the search query for Indeed
         search_query = ' '.join(keywords) if keywords else ''
         
@@ -510,13 +571,12 @@ class IndeedScraper:
             "fromage": "1"  # From last 24 hours
         }
                     
-        # Perform the search
         logger.info(f"Searching Indeed jobs with query: {search_query}")
-        return self._fetch_jobs(params, limit)
+        return params
     
     def _fetch_jobs(self, params: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
         """
-        Fetch job listings from Indeed
+        Fetch job listings from Indeed, concurrently when httpx is installed
         
         Args:
             params: Search parameters
@@ -525,9 +585,123 @@ class IndeedScraper:
         Returns:
             List of job listings
         """
+        if HAS_HTTPX:
+            try:
+                asyncio.get_running_loop()
+                in_event_loop = True
+            except RuntimeError:
+                in_event_loop = False
+            
+            if in_event_loop:
+                # asyncio.run can't be nested in a running loop, so run the fetcher on a loop of its
+                # own in another thread; this still blocks the caller's loop, so async code should
+                # use search_jobs_async instead
+                logger.warning("search_jobs called from a running event loop; use search_jobs_async instead")
+                with ThreadPoolExecutor(max_workers=1) as executor:
+                    jobs = executor.submit(asyncio.run, self._fetch_pages_async(params, limit)).result()
+            else:
+                jobs = asyncio.run(self._fetch_pages_async(params, limit))
+        else:
+            jobs = self._fetch_pages_sync(params, limit)
+        
+        return jobs or self._mock_fallback(params, limit)
+    
+    def _mock_fallback(self, params: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+        """Mock jobs for the query, used when nothing could be fetched"""
+        search_terms = []
+        if 'q' in params and params['q']:
+            search_terms = params['q'].split()
+        return generate_mock_jobs(search_terms, params.get('l'), limit)
+    
+    async def _fetch_pages_async(self, params: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+        """
+        Fetch result pages concurrently, at most self.concurrency at a time and
+        no faster than the rate limiter allows for the host. Each page is parsed as
+        soon as it arrives; jobs are returned in page order.
+        
+        Args:
+            params: Search parameters
+            limit: Maximum number of jobs to return
+            
+        Returns:
+            List of job listings (empty if nothing could be fetched)
+        """
+        jobs = []
+        next_page = 0
+        semaphore = asyncio.Semaphore(self.concurrency)
+        
+        async def fetch_page(client, page: int) -> Tuple[int, Optional[List[Dict[str, Any]]]]:
+            page_params = dict(params)
+            if page > 0:
+                page_params["start"] = str(page * JOBS_PER_PAGE)
+            
+            async with semaphore:
+                await self._throttle_request_async()
+                try:
+                    with scrape_stage("requests", "fetch"):
+                        response = await client.get(
+                            self.base_url,
+                            params=page_params,
+                            headers=self._get_random_header()
+                        )
+                except httpx.HTTPError as e:
+                    logger.error(f"Error fetching jobs page {page + 1}: {e}")
+                    return page, None
+            
+            if response.status_code != 200:
+                logger.error(f"Failed to fetch jobs page {page + 1}: {response.status_code}")
+                return page, None
+            
+            # Parse the HTML and extract job listings while other pages are still loading
+            page_jobs = []
+            with scrape_stage("requests", "parse"):
+                job_cards = select_job_cards(response.text)
+            for card in job_cards:
+                with scrape_stage("requests", "parse_job_card"):
+                    job = self._parse_job_card(card)
+                if job:
+                    page_jobs.append(job)
+            return page, page_jobs
+        
+        async with httpx.AsyncClient(timeout=REQUEST_TIMEOUT, follow_redirects=True) as client:
+            while len(jobs) < limit:
+                # Fetch just enough pages to reach the limit
+                pages_needed = -(-(limit - len(jobs)) // JOBS_PER_PAGE)
+                pages = range(next_page, next_page + pages_needed)
+                next_page += pages_needed
+                
+                results = {}
+                for finished in asyncio.as_completed([fetch_page(client, page) for page in pages]):
+                    page, page_jobs = await finished
+                    results[page] = page_jobs
+                
+                # Keep pages in order and stop at the first failed or empty one
+                reached_end = False
+                for page in pages:
+                    if not results[page]:
+                        reached_end = True
+                        break
+                    jobs.extend(results[page])
+                
+                if reached_end:
+                    break
+        
+        return jobs[:limit]
+    
+    def _fetch_pages_sync(self, params: Dict[str, Any], limit: int) -> List[Dict[str, Any]]:
+        """
+        Fetch result pages one after another with requests (used when httpx is not installed)
+        
+        Args:
+            params: Search parameters
+            limit: Maximum number of jobs to return
+            
+        Returns:
+            List of job listings (empty if nothing could be fetched)
+        """
         jobs = []
         page = 0
-        jobs_per_page = 15  # Indeed typically shows 15 jobs per page
+        jobs_per_page = JOBS_PER_PAGE
         start_val = 0
         
         while len(jobs) < limit:
@@ -540,22 +714,21 @@ class IndeedScraper:
             
             try:
                 # Make request with random headers
-                response = self.session.get(
-                    INDEED_JOB_URL,
-                    params=params,
-                    headers=self._get_random_header()
-                )
+                with scrape_stage("requests", "fetch"):
+                    response = self.session.get(
+                        self.base_url,
+                        params=params,
+                        headers=self._get_random_header()
+                    )
                 
                 # Break if the request failed
                 if response.status_code != 200:
                     logger.error(f"Failed to fetch jobs: {response.status_code}")
                     break
                 
-                # Parse the HTML
-                soup = BeautifulSoup(response.text, 'html.parser')
-                
-                # Extract job listings - Indeed uses a different structure
-                job_cards = soup.select('div.job_seen_beacon')
+                # Parse the HTML and extract job listings - Indeed uses a different structure
+                with scrape_stage("requests", "parse"):
+                    job_cards = select_job_cards(response.text)
                 
                 if not job_cards:
                     # No more job cards found
@@ -563,7 +736,8 @@ class IndeedScraper:
                 
                 # Process each job card
                 for card in job_cards:
-                    job = self._parse_job_card(card)
+                    with scrape_stage("requests", "parse_job_card"):
+                        job = self._parse_job_card(card)
                     if job:
                         jobs.append(job)
                     
@@ -582,13 +756,6 @@ class IndeedScraper:
                 logger.error(f"Error fetching jobs: {e}")
                 break
         
-        # If no jobs found or error occurred, return mock data
-        if not jobs:
-            search_terms = []
-            if 'q' in params and params['q']:
-                search_terms = params['q'].split()
-            return generate_mock_jobs(search_terms, params.get('l'), limit)
-            
         return jobs[:limit]
     
     def _parse_job_card(self, card) -> Optional[Dict[str, Any]]:
@@ -596,7 +763,7 @@ class IndeedScraper:
         Parse a job card from Indeed
         
         Args:
-            card: BeautifulSoup element for the job card
+            card: Job card element from job_parser.select_job_cards
             
         Returns:
             Job information as a dictionary or None if parsing failed
@@ -830,6 +997,11 @@ def search_jobs(keywords=None, location=None, categories=None, limit=DEFAULT_LIM
     scraper = get_scraper()
     return scraper.search_jobs(keywords, location, categories, limit)
 
+async def search_jobs_async(keywords=None, location=None, categories=None, limit=DEFAULT_LIMIT):
+    """Convenience function to search jobs from a running event loop"""
+    scraper = get_scraper()
+    return await scraper.search_jobs_async(keywords, location, categories, limit)
+
 # For testing
 if __name__ == "__main__":
     # Test the scraper
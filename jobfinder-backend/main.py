@@ -1,9 +1,12 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse, StreamingResponse
 from fastapi.security import OAuth2PasswordRequestForm
-from typing import List, Optional, Dict, Any
-from pydantic import BaseModel, EmailStr
+from typing import AsyncIterator, List, Literal, Optional, Dict, Any
+from pydantic import BaseModel, EmailStr, Field
 import os
+import json
+import asyncio
 from dotenv import load_dotenv
 import logging
 
@@ -13,11 +16,23 @@ logger = logging.getLogger(__name__)
 
 # Import our modules
 from database import (
+    DatabaseError,
     initialize_database, 
+    close_db_connection,
+    JOBS_PAGE_SIZE,
+    JOBS_MAX_PAGE_SIZE
+)
+# Endpoints use the async database layer so queries don't block the event loop
+from async_database import (
+    close_pool as close_async_db_pool,
+    get_jobs_page,
     update_user_preferences, 
     save_job_for_user,
+    save_jobs_for_user,
     unsave_job_for_user,
+    unsave_jobs_for_user,
     get_saved_jobs,
+    get_saved_jobs_version,
     create_user as db_create_user,
     get_user_by_email,
     update_last_login
@@ -28,18 +43,29 @@ from auth import (
     UserOut, 
     UserLogin,
     get_password_hash, 
-    authenticate_user, 
+    authenticate_user_async, 
     create_access_token, 
     get_current_user
 )
-# Import our Indeed scraper
-from indeed_scraper import search_jobs as indeed_search_jobs, SEARCH_TERM_DICT
+from statements import statements
+# Import our Indeed search categories and the background scrape queue
+from indeed_scraper import SEARCH_TERM_DICT, close_pool as close_driver_pool, stream_jobs
+from scrape_queue import start_workers, stop_workers, enqueue_refresh
+from scrape_flights import TooManyFlightsError, get_flights, shutdown_flights
+from search_pipeline import SearchPlan, compile_search
+import metrics
+from metrics import MetricsMiddleware
+from responses import CompressionMiddleware, FastJSONResponse, content_etag, etag_matches, make_etag, not_modified
 
 # Load environment variables
 load_dotenv()
 
 # Initialize FastAPI app
-app = FastAPI(title="JobFinder API")
+# Responses are serialized with orjson (see responses.py)
+app = FastAPI(title="JobFinder API", default_response_class=FastJSONResponse)
+
+# Most job ids accepted by one bulk save/unsave request
+BULK_SAVE_MAX_JOBS = int(os.getenv("BULK_SAVE_MAX_JOBS", "200"))
 
 # CORS settings
 origins = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
@@ -51,8 +77,17 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Let browsers read the cursor of the next page of /api/jobs and /api/search,
+    # the ETags of /api/categories and /api/jobs/saved, and request timings
+    expose_headers=["X-Next-Cursor", "ETag", "Server-Timing"],
 )
 
+# Compress responses with brotli or gzip when the client accepts it
+app.add_middleware(CompressionMiddleware)
+
+# Time requests and add their Server-Timing header; added last so it wraps the other middleware
+app.add_middleware(MetricsMiddleware)
+
 # Models
 class SearchParams(BaseModel):
     keywords: Optional[str] = None
@@ -61,9 +96,12 @@ class SearchParams(BaseModel):
     job_type: Optional[str] = None
     experience_level: Optional[str] = None
     min_salary: Optional[int] = None
+    max_salary: Optional[int] = None
     remote_only: Optional[bool] = False
     recent_only: Optional[bool] = False
     categories: Optional[List[str]] = None
+    limit: int = Field(JOBS_PAGE_SIZE, ge=1, le=JOBS_MAX_PAGE_SIZE)
+    cursor: Optional[str] = None
 
 class UserPreferences(BaseModel):
     email_notifications: Optional[bool] = None
@@ -73,32 +111,63 @@ class UserPreferences(BaseModel):
 class SaveJobRequest(BaseModel):
     job_id: int
 
+class BulkSaveJobsRequest(BaseModel):
+    job_ids: List[int] = Field(..., min_length=1, max_length=BULK_SAVE_MAX_JOBS)
+    action: Literal["save", "unsave"] = "save"
+
+# Writes that fail report a temporarily unavailable service rather than an empty result
+@app.exception_handler(DatabaseError)
+async def database_error_handler(request: Request, exc: DatabaseError):
+    return FastJSONResponse(
+        {"detail": "Database unavailable, try again shortly"},
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        headers={"Retry-After": "5"}
+    )
+
 # Initialize database on startup
 @app.on_event("startup")
 async def startup_event():
     initialize_database()
+    start_workers()
+
+# Stop background scrape workers, quit the Chrome drivers of streaming searches and close
+# pooled database connections on shutdown
+@app.on_event("shutdown")
+async def shutdown_event():
+    stop_workers()
+    shutdown_flights()
+    close_driver_pool()
+    await close_async_db_pool()
+    close_db_connection()
+    statements.log_stats()
 
 # Authentication endpoints
 @app.post("/api/auth/register", response_model=Dict[str, Any])
 async def register_user(user_data: UserCreate):
     # Check if user already exists
-    existing_user = get_user_by_email(user_data.email)
+    existing_user = await get_user_by_email(user_data.email)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Email already registered"
         )
     
-    # Hash the password
-    hashed_password = get_password_hash(user_data.password)
+    # Hash the password; bcrypt is deliberately slow, so keep it off the event loop
+    hashed_password = await asyncio.to_thread(get_password_hash, user_data.password)
     
-    # Create the user in the database
-    new_user = db_create_user(
-        email=user_data.email,
-        password_hash=hashed_password,
-        first_name=user_data.first_name,
-        last_name=user_data.last_name
-    )
+    # Create the user in the database; a concurrent registration may have taken the email meanwhile
+    try:
+        new_user = await db_create_user(
+            email=user_data.email,
+            password_hash=hashed_password,
+            first_name=user_data.first_name,
+            last_name=user_data.last_name
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered"
+        )
     
     # Create access token
     access_token = create_access_token(
@@ -118,7 +187,7 @@ async def register_user(user_data: UserCreate):
 @app.post("/api/auth/login", response_model=Token)
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
     # Authenticate user
-    user = authenticate_user(form_data.username, form_data.password, get_user_by_email)
+    user = await authenticate_user_async(form_data.username, form_data.password, get_user_by_email)
     
     if not user:
         raise HTTPException(
@@ -128,7 +197,7 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
         )
     
     # Update last login timestamp
-    update_last_login(user["id"])
+    await update_last_login(user["id"])
     
     # Create access token
     access_token = create_access_token(
@@ -156,147 +225,149 @@ async def get_jobs_endpoint(
     job_type: Optional[str] = None,
     experience_level: Optional[str] = None,
     min_salary: Optional[int] = None,
+    max_salary: Optional[int] = None,
     remote_only: Optional[bool] = False,
     recent_only: Optional[bool] = False,
-    categories: Optional[str] = None
+    categories: Optional[str] = None,
+    limit: int = Query(JOBS_PAGE_SIZE, ge=1, le=JOBS_MAX_PAGE_SIZE),
+    cursor: Optional[str] = None
 ):
     """
-    Retrieve matching jobs from Indeed
+    Retrieve a page of matching jobs from the jobs table and queue an Indeed refresh for the query
+    
+    The cursor of the next page is returned in the X-Next-Cursor header.
     """
-    # Process search keywords
-    search_keywords = []
-    if keywords:
-        search_keywords.extend(keywords.split())
-    if role:
-        search_keywords.extend(role.split())
-    
-    # Process categories
-    search_categories = []
-    if categories:
-        search_categories = categories.split(',')
-    
-    # Add remote category if specified
-    if remote_only:
-        search_categories.append("remote")
-    
-    # Add experience level category if specified
-    if experience_level:
-        if experience_level.lower() in ["junior", "entry-level", "entry level"]:
-            search_categories.append("entry_level")
-        elif experience_level.lower() in ["senior", "expert"]:
-            search_categories.append("senior")
+    plan = compile_search(
+        keywords=keywords,
+        role=role,
+        location=location,
+        job_type=job_type,
+        experience_level=experience_level,
+        min_salary=min_salary,
+        max_salary=max_salary,
+        remote_only=remote_only,
+        categories=categories.split(',') if categories else None
+    )
     
     # Log the search request
-    logger.info(f"Searching jobs with: keywords={search_keywords}, location={location}, categories={search_categories}")
-    
-    # Call Indeed scraper
-    jobs = indeed_search_jobs(
-        keywords=search_keywords,
-        location=location, 
-        categories=search_categories,
-        limit=25
-    )
+    logger.info(f"Searching jobs with: keywords={plan.keywords}, location={plan.location}, categories={plan.categories}")
     
-    # Apply filters
-    if job_type or min_salary:
-        filtered_jobs = []
-        for job in jobs:
-            # Filter by job type if specified
-            if job_type and job.get("job_type") != job_type:
-                continue
-            
-            # Filter by minimum salary if specified
-            if min_salary:
-                # Extract minimum salary from range
-                salary_range = job.get("salary_range", "")
-                try:
-                    min_salary_str = salary_range.split("-")[0].strip()
-                    min_salary_value = int(min_salary_str.replace("$", "").replace(",", ""))
-                    if min_salary_value < min_salary * 1000:
-                        continue
-                except (ValueError, IndexError):
-                    # Skip this job if we can't parse the salary
-                    pass
-            
-            filtered_jobs.append(job)
-        
-        return filtered_jobs
-    
-    return jobs
+    return await search_jobs_table(plan, limit, cursor)
 
 @app.post("/api/search")
 async def submit_search(search_params: SearchParams):
     """
-    Submit search parameters and return matching jobs from Indeed
+    Submit search parameters, return a page of matching jobs from the jobs table and queue an Indeed refresh
+    
+    The cursor of the next page is returned in the X-Next-Cursor header.
     """
-    # Process search keywords
-    search_keywords = []
-    if search_params.keywords:
-        search_keywords.extend(search_params.keywords.split())
-    if search_params.role:
-        search_keywords.extend(search_params.role.split())
-    
-    # Process categories
-    search_categories = search_params.categories or []
-    
-    # Add remote category if specified
-    if search_params.remote_only:
-        search_categories.append("remote")
-    
-    # Add experience level category if specified
-    if search_params.experience_level:
-        if search_params.experience_level.lower() in ["junior", "entry-level", "entry level"]:
-            search_categories.append("entry_level")
-        elif search_params.experience_level.lower() in ["senior", "expert"]:
-            search_categories.append("senior")
+    plan = compile_search_params(search_params)
     
     # Log the search request
-    logger.info(f"API search with: keywords={search_keywords}, location={search_params.location}, categories={search_categories}")
-    
-    # Call Indeed scraper
-    jobs = indeed_search_jobs(
-        keywords=search_keywords,
-        location=search_params.location, 
-        categories=search_categories,
-        limit=25
+    logger.info(f"API search with: keywords={plan.keywords}, location={plan.location}, categories={plan.categories}")
+    
+    return await search_jobs_table(plan, search_params.limit, search_params.cursor)
+
+async def search_jobs_table(plan: SearchPlan, limit: int, cursor: Optional[str]) -> FastJSONResponse:
+    """
+    Answer a search with one page from the jobs table, which applies every filter in SQL,
+    and queue an Indeed refresh for it. The cursor of the next page goes in the X-Next-Cursor header.
+    """
+    # Refresh the stored jobs for this query in the background, once per search rather than per page
+    if not cursor:
+        enqueue_refresh(
+            keywords=plan.keywords,
+            location=plan.location,
+            categories=plan.categories,
+            limit=plan.fetch_limit,
+            filters=plan.source_filters
+        )
+    
+    try:
+        jobs, next_cursor = await get_jobs_page(plan.db_filters(), limit=limit, cursor=cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    
+    # Returned as a response so the jobs are serialized once, by orjson
+    return FastJSONResponse(jobs, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+def compile_search_params(search_params: SearchParams) -> SearchPlan:
+    """
+    Compile the body of a search request into a SearchPlan
+    """
+    return compile_search(
+        keywords=search_params.keywords,
+        role=search_params.role,
+        location=search_params.location,
+        job_type=search_params.job_type,
+        experience_level=search_params.experience_level,
+        min_salary=search_params.min_salary,
+        max_salary=search_params.max_salary,
+        remote_only=search_params.remote_only,
+        categories=search_params.categories
     )
+
+@app.post("/api/search/stream")
+async def stream_search(search_params: SearchParams, request: Request):
+    """
+    Scrape Indeed for the search and stream each matching job as soon as its result page is parsed.
+    Responds with NDJSON (one job per line), or Server-Sent Events if the client accepts text/event-stream.
+    """
+    plan = compile_search_params(search_params)
     
-    # Apply filters
-    if search_params.job_type or search_params.min_salary:
-        filtered_jobs = []
-        for job in jobs:
-            # Filter by job type if specified
-            if search_params.job_type and job.get("job_type") != search_params.job_type:
-                continue
-            
-            # Filter by minimum salary if specified
-            if search_params.min_salary:
-                # Extract minimum salary from range
-                salary_range = job.get("salary_range", "")
-                try:
-                    min_salary_str = salary_range.split("-")[0].strip()
-                    min_salary_value = int(min_salary_str.replace("$", "").replace(",", ""))
-                    if min_salary_value < search_params.min_salary * 1000:
-                        continue
-                except (ValueError, IndexError):
-                    # Skip this job if we can't parse the salary
-                    pass
-            
-            filtered_jobs.append(job)
-        
-        return filtered_jobs
-    
-    return jobs
+    # Log the search request
+    logger.info(f"Streaming search with: keywords={plan.keywords}, location={plan.location}, categories={plan.categories}")
+    
+    use_sse = "text/event-stream" in request.headers.get("accept", "")
+    
+    # The scrape runs on the bounded scrape executor, never on the event loop. Concurrent
+    # requests for the same normalized query share one scrape and its results.
+    # Filters Indeed can't apply are checked on each job, scraping more pages until enough match.
+    try:
+        flight = get_flights().join(plan.flight_key(), lambda: plan.scrape(stream_jobs))
+    except TooManyFlightsError as e:
+        logger.warning(f"Refusing streaming search: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many searches in progress, try again shortly",
+            headers={"Retry-After": "5"}
+        )
+    
+    def encode(event: Dict[str, Any]) -> str:
+        data = json.dumps(event, default=str)
+        return f"data: {data}\n\n" if use_sse else f"{data}\n"
+    
+    async def generate() -> AsyncIterator[str]:
+        try:
+            async for job in flight.subscribe():
+                yield encode(job)
+        except Exception as e:
+            # Headers are already sent, so report the failure in the stream itself
+            logger.error(f"Error streaming search results: {e}")
+            yield encode({"error": "Search failed"})
+    
+    return StreamingResponse(
+        generate(),
+        media_type="text/event-stream" if use_sse else "application/x-ndjson",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+# Categories are fixed for the life of the process, so the response and its ETag are built once
+CATEGORIES = {
+    "categories": list(SEARCH_TERM_DICT.keys()),
+    "term_details": SEARCH_TERM_DICT
+}
+CATEGORIES_ETAG = content_etag(CATEGORIES)
 
 @app.get("/api/categories")
-async def get_categories():
+async def get_categories(request: Request):
     """
     Get available search categories
     """
-    return {
-        "categories": list(SEARCH_TERM_DICT.keys()),
-        "term_details": SEARCH_TERM_DICT
-    }
+    if etag_matches(request.headers.get("if-none-match"), CATEGORIES_ETAG):
+        return not_modified(CATEGORIES_ETAG)
+    
+    return FastJSONResponse(CATEGORIES, headers={"ETag": CATEGORIES_ETAG})
 
 # User preferences endpoint
 @app.get("/api/preferences")
@@ -321,7 +392,7 @@ async def update_preferences(
     Update user preferences (requires authentication)
     """
     user_id = current_user.user_id
-    updated_prefs = update_user_preferences(user_id, preferences.dict(exclude_none=True))
+    updated_prefs = await update_user_preferences(user_id, preferences.dict(exclude_none=True))
     
     return {
         "status": "success", 
@@ -338,7 +409,9 @@ async def save_job(job_request: SaveJobRequest, current_user = Depends(get_curre
     user_id = int(current_user.user_id)
     job_id = job_request.job_id
     
-    saved_job = save_job_for_user(user_id, job_id)
+    saved_job = await save_job_for_user(user_id, job_id)
+    if saved_job is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
     
     return {
         "status": "success",
@@ -353,7 +426,7 @@ async def unsave_job(job_id: int, current_user = Depends(get_current_user)):
     """
     user_id = int(current_user.user_id)
     
-    result = unsave_job_for_user(user_id, job_id)
+    result = await unsave_job_for_user(user_id, job_id)
     
     if result["removed"]:
         return {
@@ -368,16 +441,66 @@ async def unsave_job(job_id: int, current_user = Depends(get_current_user)):
             "data": result
         }
 
+@app.post("/api/jobs/save/bulk")
+async def bulk_save_jobs(bulk_request: BulkSaveJobsRequest, current_user = Depends(get_current_user)):
+    """
+    Save or unsave a list of jobs for the current user in one request (requires authentication)
+    """
+    user_id = int(current_user.user_id)
+    job_ids = list(dict.fromkeys(bulk_request.job_ids))
+    
+    if bulk_request.action == "unsave":
+        removed = set(await unsave_jobs_for_user(user_id, job_ids))
+        return {
+            "status": "success",
+            "message": f"{len(removed)} job(s) removed from saved jobs",
+            "data": {
+                "removed": [job_id for job_id in job_ids if job_id in removed],
+                "not_saved": [job_id for job_id in job_ids if job_id not in removed]
+            }
+        }
+    
+    # job id -> whether this request saved it (False if it was already saved)
+    created = {row["job_id"]: row["created"] for row in await save_jobs_for_user(user_id, job_ids)}
+    
+    return {
+        "status": "success",
+        "message": f"{sum(created.values())} job(s) saved",
+        "data": {
+            "saved": [job_id for job_id in job_ids if created.get(job_id) is True],
+            "already_saved": [job_id for job_id in job_ids if created.get(job_id) is False],
+            "not_found": [job_id for job_id in job_ids if job_id not in created]
+        }
+    }
+
 @app.get("/api/jobs/saved")
-async def get_user_saved_jobs(current_user = Depends(get_current_user)):
+async def get_user_saved_jobs(request: Request, current_user = Depends(get_current_user)):
     """
     Get all jobs saved by the current user (requires authentication)
+    
+    The ETag is the user's saved jobs version, so a poll with a matching If-None-Match
+    gets a 304 without the saved jobs being queried.
     """
     user_id = int(current_user.user_id)
     
-    jobs = get_saved_jobs(user_id)
+    # Read the version before the jobs: a save landing in between leaves a stale ETag on
+    # a fresh list, which only costs the next poll a full response
+    etag = make_etag("saved", user_id, await get_saved_jobs_version(user_id))
+    # Per-user content; clients revalidate on every poll
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return not_modified(etag, headers)
+    
+    jobs = await get_saved_jobs(user_id)
     
-    return jobs
+    return FastJSONResponse(jobs, headers=headers)
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics():
+    """
+    Request, scrape stage, database call and prepared statement metrics in the Prometheus text format
+    """
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
 
 @app.get("/")
 async def root():
@@ -0,0 +1,540 @@
+import bisect
+import heapq
+import re
+import threading
+import logging
+from functools import lru_cache
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Columns of a stored job, as returned by the Postgres backend
+JOB_FIELDS = [
+    "id", "title", "company", "location", "description", "salary_range",
+    "job_type", "experience_level", "skills", "posted_at", "link",
+    "salary_min", "salary_max", "salary_period"
+]
+
+# Keyword weights per field, matching setweight A/B/C and ts_rank's default weights
+FIELD_WEIGHTS = {"title": 1.0, "skills": 0.4, "description": 0.2}
+
+# Words ignored in keyword searches, like the english text search configuration does
+STOP_WORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "the", "to", "with"
+}
+
+# Tokens keep + and # so skills like C++ and C# are searchable
+TOKEN_RE = re.compile(r"[a-z0-9+#]+")
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return [token for token in TOKEN_RE.findall((text or "").lower()) if token not in STOP_WORDS]
+
+# Suffix rules of steps 2, 3 and 4 of the Porter stemmer. Within a step the first suffix
+# a word ends with is the only one tried, so longer suffixes come before their endings.
+_STEP2_SUFFIXES = [
+    ("ational", "ate"), ("tional", "tion"), ("enci", "ence"), ("anci", "ance"), ("izer", "ize"),
+    ("bli", "ble"), ("alli", "al"), ("entli", "ent"), ("eli", "e"), ("ousli", "ous"),
+    ("ization", "ize"), ("ation", "ate"), ("ator", "ate"), ("alism", "al"), ("iveness", "ive"),
+    ("fulness", "ful"), ("ousness", "ous"), ("aliti", "al"), ("iviti", "ive"), ("biliti", "ble"),
+    ("logi", "log")
+]
+_STEP3_SUFFIXES = [
+    ("icate", "ic"), ("ative", ""), ("alize", "al"), ("iciti", "ic"), ("ical", "ic"), ("ful", ""), ("ness", "")
+]
+_STEP4_SUFFIXES = [
+    "al", "ance", "ence", "er", "ic", "able", "ible", "ant", "ement", "ment", "ent", "ion", "ou",
+    "ism", "ate", "iti", "ous", "ive", "ize"
+]
+
+def _is_consonant(word: str, i: int) -> bool:
+    if word[i] in "aeiou":
+        return False
+    if word[i] == "y":
+        return i == 0 or not _is_consonant(word, i - 1)
+    return True
+
+def _measure(word: str) -> int:
+    """Number of vowel-consonant sequences in word, m in [C](VC)^m[V]"""
+    m, i, n = 0, 0, len(word)
+    while i < n and _is_consonant(word, i):
+        i += 1
+    while i < n:
+        while i < n and not _is_consonant(word, i):
+            i += 1
+        if i == n:
+            break
+        while i < n and _is_consonant(word, i):
+            i += 1
+        m += 1
+    return m
+
+def _has_vowel(word: str) -> bool:
+    return any(not _is_consonant(word, i) for i in range(len(word)))
+
+def _ends_double_consonant(word: str) -> bool:
+    return len(word) >= 2 and word[-1] == word[-2] and _is_consonant(word, len(word) - 1)
+
+def _ends_cvc(word: str) -> bool:
+    return (len(word) >= 3 and _is_consonant(word, len(word) - 3) and not _is_consonant(word, len(word) - 2)
+            and _is_consonant(word, len(word) - 1) and word[-1] not in "wxy")
+
+# Job text has a small vocabulary, so each word is stemmed once
+@lru_cache(maxsize=65536)
+def stem(token: str) -> str:
+    """
+    Reduce a token to its Porter stem, as the porter tokenizer of the SQLite backend's
+    FTS5 index does (the english configuration of PostgreSQL uses the close Snowball
+    variant), so "developers" and "Developer" match. Tokens with digits or symbols, and
+    tokens shorter than 3 letters, are kept as they are.
+    """
+    if len(token) < 3 or not token.isalpha():
+        return token
+    word = token
+
+    # Step 1a: plurals
+    if word.endswith("sses") or word.endswith("ies"):
+        word = word[:-2]
+    elif word.endswith("s") and not word.endswith("ss"):
+        word = word[:-1]
+
+    # Step 1b: -eed, -ed, -ing
+    if word.endswith("eed"):
+        if _measure(word[:-3]) > 0:
+            word = word[:-1]
+    else:
+        for suffix in ("ed", "ing"):
+            if word.endswith(suffix) and _has_vowel(word[:-len(suffix)]):
+                word = word[:-len(suffix)]
+                if word.endswith(("at", "bl", "iz")):
+                    word += "e"
+                elif _ends_double_consonant(word) and word[-1] not in "lsz":
+                    word = word[:-1]
+                elif _measure(word) == 1 and _ends_cvc(word):
+                    word += "e"
+                break
+
+    # Step 1c: -y to -i after a vowel
+    if word.endswith("y") and _has_vowel(word[:-1]):
+        word = word[:-1] + "i"
+
+    # Steps 2 and 3: map double and single suffixes to shorter ones
+    for rules in (_STEP2_SUFFIXES, _STEP3_SUFFIXES):
+        for suffix, replacement in rules:
+            if word.endswith(suffix):
+                if _measure(word[:-len(suffix)]) > 0:
+                    word = word[:-len(suffix)] + replacement
+                break
+
+    # Step 4: drop suffixes of longer stems
+    for suffix in _STEP4_SUFFIXES:
+        if word.endswith(suffix):
+            rest = word[:-len(suffix)]
+            if suffix == "ion" and not rest.endswith(("s", "t")):
+                continue
+            if _measure(rest) > 1:
+                word = rest
+            break
+
+    # Step 5: final -e and -ll
+    if word.endswith("e"):
+        m = _measure(word[:-1])
+        if m > 1 or (m == 1 and not _ends_cvc(word[:-1])):
+            word = word[:-1]
+    if word.endswith("ll") and _measure(word) > 1:
+        word = word[:-1]
+
+    return word
+
+def search_terms(text: Optional[str]) -> List[str]:
+    """Stemmed tokens of text, as jobs are indexed and keywords matched"""
+    return [stem(token) for token in tokenize(text)]
+
+def _timestamp(posted_at: Any) -> float:
+    """Sort key of a posted_at value (datetime or ISO 8601 string)"""
+    if isinstance(posted_at, datetime):
+        value = posted_at
+    else:
+        try:
+            value = datetime.fromisoformat(str(posted_at).replace("Z", "+00:00"))
+        except ValueError:
+            return 0.0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+class SortedIndex:
+    """
+    Sorted list of (key, id) entries.
+
+    Additions are buffered and merged on the next read: a few are inserted in place,
+    a large batch (like a bulk load) is appended and the list re-sorted once, which
+    Timsort does in near-linear time on mostly sorted data.
+    """
+
+    def __init__(self):
+        self._entries: List[Tuple[Any, int]] = []
+        self._pending: List[Tuple[Any, int]] = []
+
+    def add(self, key: Any, job_id: int) -> None:
+        self._pending.append((key, job_id))
+
+    def remove(self, key: Any, job_id: int) -> None:
+        self._flush()
+        i = bisect.bisect_left(self._entries, (key, job_id))
+        if i < len(self._entries) and self._entries[i] == (key, job_id):
+            del self._entries[i]
+
+    def _flush(self) -> None:
+        if not self._pending:
+            return
+        if len(self._pending) <= 32:
+            for entry in self._pending:
+                bisect.insort(self._entries, entry)
+        else:
+            self._entries.extend(self._pending)
+            self._entries.sort()
+        self._pending = []
+
+    def at_least(self, key: Any) -> Set[int]:
+        """Ids with key >= the given key"""
+        self._flush()
+        return {job_id for _, job_id in self._entries[bisect.bisect_left(self._entries, (key,)):]}
+
+    def at_most(self, key: Any) -> Set[int]:
+        """Ids with key <= the given key"""
+        self._flush()
+        return {job_id for _, job_id in self._entries[:bisect.bisect_right(self._entries, (key, float("inf")))]}
+
+    def descending(self) -> Iterable[int]:
+        """Ids from the highest key to the lowest"""
+        self._flush()
+        return (job_id for _, job_id in reversed(self._entries))
+
+class MemoryStore:
+    def __init__(self):
+        """
+        In-memory job store with the same operations as the Postgres backend.
+
+        Jobs are indexed so filtered listings don't scan every job: an inverted index
+        from keyword tokens to weighted job ids, hash indexes on job type, experience
+        level, exact location and the (title, company, location) identity, sorted
+        indexes on the salary bounds, and the newest-first order of all jobs.
+        Users, preferences and saved jobs live in dictionaries keyed like the
+        corresponding tables.
+        """
+        self._lock = threading.RLock()
+        self.jobs: Dict[int, Dict[str, Any]] = {}
+        self._next_job_id = 1
+        self._identity: Dict[Tuple[str, str, str], int] = {}
+        self._tokens: Dict[str, Dict[int, float]] = {}  # token -> job id -> weight
+        self._by_job_type: Dict[str, Set[int]] = {}
+        self._by_experience_level: Dict[str, Set[int]] = {}
+        self._by_location: Dict[str, Set[int]] = {}  # lowercased location -> job ids
+        self._salary_min = SortedIndex()
+        self._salary_max = SortedIndex()
+        self._posted_at: Dict[int, float] = {}  # job id -> posted_at timestamp
+        self._posted = SortedIndex()  # (posted_at timestamp, id), so ties break on id like the SQL
+
+        self.users: Dict[int, Dict[str, Any]] = {}
+        self._users_by_email: Dict[str, int] = {}  # lowercased email -> user id
+        self.preferences: Dict[int, Dict[str, Any]] = {}
+        self.saved_jobs: Dict[int, Dict[int, Dict[str, Any]]] = {}  # user id -> job id -> saved_jobs row
+        self.saved_jobs_versions: Dict[int, int] = {}  # user id -> users.saved_jobs_version
+        self._next_saved_id = 1
+
+    # Jobs
+
+    def _index_job(self, job: Dict[str, Any]) -> None:
+        job_id = job["id"]
+        weights: Dict[str, float] = {}
+        for field, weight in FIELD_WEIGHTS.items():
+            value = job.get(field)
+            text = " ".join(value) if isinstance(value, list) else value
+            for token in search_terms(text):
+                weights[token] = weights.get(token, 0.0) + weight
+        for token, weight in weights.items():
+            self._tokens.setdefault(token, {})[job_id] = weight
+
+        self._by_job_type.setdefault(job.get("job_type"), set()).add(job_id)
+        self._by_experience_level.setdefault(job.get("experience_level"), set()).add(job_id)
+        self._by_location.setdefault((job.get("location") or "").lower(), set()).add(job_id)
+        if job.get("salary_min") is not None:
+            self._salary_min.add(job["salary_min"], job_id)
+        if job.get("salary_max") is not None:
+            self._salary_max.add(job["salary_max"], job_id)
+        self._posted_at[job_id] = _timestamp(job.get("posted_at"))
+        self._posted.add(self._posted_at[job_id], job_id)
+
+    def upsert_jobs(self, jobs: List[Dict[str, Any]]) -> List[int]:
+        """
+        Store jobs that don't exist yet (by title, company, location).
+
+        Args:
+            jobs: Jobs with every column but id, salary bounds already parsed
+
+        Returns:
+            Ids in the same order as jobs, existing ones for jobs already stored
+        """
+        ids = []
+        with self._lock:
+            for job in jobs:
+                key = (job.get("title"), job.get("company"), job.get("location"))
+                job_id = self._identity.get(key)
+                if job_id is None:
+                    job_id = self._next_job_id
+                    self._next_job_id += 1
+                    stored = {field: job.get(field) for field in JOB_FIELDS}
+                    stored["id"] = job_id
+                    self.jobs[job_id] = stored
+                    self._identity[key] = job_id
+                    self._index_job(stored)
+                ids.append(job_id)
+        return ids
+
+    def update_salary(self, job_id: int, salary_min: Optional[int], salary_max: Optional[int],
+                      salary_period: Optional[str]) -> None:
+        """Replace the parsed salary bounds of a job, keeping the salary indexes in step"""
+        with self._lock:
+            job = self.jobs[job_id]
+            if job.get("salary_min") is not None:
+                self._salary_min.remove(job["salary_min"], job_id)
+            if job.get("salary_max") is not None:
+                self._salary_max.remove(job["salary_max"], job_id)
+            job["salary_min"], job["salary_max"], job["salary_period"] = salary_min, salary_max, salary_period
+            if salary_min is not None:
+                self._salary_min.add(salary_min, job_id)
+            if salary_max is not None:
+                self._salary_max.add(salary_max, job_id)
+
+    def _keyword_ranks(self, keywords: str) -> Optional[Dict[int, float]]:
+        """
+        Match keywords like websearch_to_tsquery: every term must match, "-term" excludes
+        and OR separates alternatives. Quotes group words, which must all match. Words
+        match by their stems, so "developers" finds "Developer".
+
+        Returns:
+            Rank of every matching job, or None if the keywords hold no searchable terms
+        """
+        alternatives = []
+        for alternative in re.split(r"\s+or\s+", keywords.strip(), flags=re.IGNORECASE):
+            required, excluded = [], []
+            for term in re.findall(r'-?"[^"]*"|\S+', alternative):
+                (excluded if term.startswith("-") else required).extend(search_terms(term))
+            if required or excluded:
+                alternatives.append((required, excluded))
+
+        if not alternatives:
+            return None
+
+        ranks: Dict[int, float] = {}
+        for required, excluded in alternatives:
+            if required:
+                # Intersect from the rarest token up, summing weights as we go
+                postings = sorted((self._tokens.get(token, {}) for token in required), key=len)
+                matched = dict(postings[0])
+                for posting in postings[1:]:
+                    matched = {job_id: rank + posting[job_id] for job_id, rank in matched.items() if job_id in posting}
+            else:
+                matched = dict.fromkeys(self.jobs, 0.0)
+            for token in excluded:
+                for job_id in self._tokens.get(token, {}):
+                    matched.pop(job_id, None)
+            if not ranks:
+                ranks = matched
+            else:
+                for job_id, rank in matched.items():
+                    if rank > ranks.get(job_id, -1.0):
+                        ranks[job_id] = rank
+        return ranks
+
+    def search_jobs(self, filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None,
+                    offset: int = 0) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Filter and order jobs like the Postgres backend.
+
+        Args:
+            filters: Filters as accepted by database.get_jobs
+            limit: Maximum number of jobs to return (all if None)
+            offset: Number of matching jobs to skip
+
+        Returns:
+            Copies of the matching jobs, and whether more jobs match after them
+        """
+        filters = filters or {}
+        with self._lock:
+            candidates: Optional[Set[int]] = None
+
+            def narrow(ids: Set[int]) -> None:
+                nonlocal candidates
+                candidates = set(ids) if candidates is None else candidates & ids
+
+            ranks = None
+            if filters.get("keywords"):
+                ranks = self._keyword_ranks(filters["keywords"])
+                if ranks is not None:
+                    narrow(set(ranks))
+
+            if filters.get("job_type"):
+                narrow(self._by_job_type.get(filters["job_type"], set()))
+
+            if filters.get("experience_level"):
+                narrow(self._by_experience_level.get(filters["experience_level"], set()))
+
+            if filters.get("location"):
+                # Substring match like ILIKE '%location%', checked once per distinct location
+                location = filters["location"].lower()
+                ids = set()
+                for value, location_ids in self._by_location.items():
+                    if location in value:
+                        ids |= location_ids
+                narrow(ids)
+
+            # Salary filters are in thousands per year; the minimum only applies above 10k
+            if filters.get("min_salary") and int(filters["min_salary"]) > 10:
+                narrow(self._salary_min.at_least(int(filters["min_salary"]) * 1000))
+
+            if filters.get("max_salary"):
+                narrow(self._salary_max.at_most(int(filters["max_salary"]) * 1000))
+
+            end = None if limit is None else offset + limit
+            posted_at = self._posted_at
+            if ranks is not None:
+                # Best matches first, newest first among equally ranked jobs
+                key = lambda job_id: (ranks[job_id], posted_at[job_id], job_id)
+            else:
+                key = lambda job_id: (posted_at[job_id], job_id)
+
+            if candidates is None or (ranks is None and len(candidates) * 8 >= len(self.jobs)):
+                # Most jobs match: walk the newest-first order until the page is full
+                order = []
+                for job_id in self._posted.descending():
+                    if candidates is None or job_id in candidates:
+                        order.append(job_id)
+                        if end is not None and len(order) > end:
+                            break
+            elif end is not None:
+                # Select the top of the page (and one more to tell if there is a next page)
+                # without sorting every match
+                order = heapq.nlargest(end + 1, candidates, key=key)
+            else:
+                order = sorted(candidates, key=key, reverse=True)
+
+            page = order[offset:end]
+            has_more = end is not None and len(order) > end
+            return [dict(self.jobs[job_id]) for job_id in page], has_more
+
+    # Users
+
+    def create_user(self, email: str, password_hash: str, first_name: Optional[str] = None,
+                    last_name: Optional[str] = None) -> Dict[str, Any]:
+        """
+        Raises:
+            ValueError: If a user with this email already exists
+        """
+        with self._lock:
+            if email.lower() in self._users_by_email:
+                raise ValueError("Email already registered")
+            user = {
+                "id": len(self.users) + 1,
+                "email": email,
+                "password_hash": password_hash,
+                "first_name": first_name,
+                "last_name": last_name,
+                "created_at": datetime.now(timezone.utc),
+                "last_login": None
+            }
+            self.users[user["id"]] = user
+            self._users_by_email[email.lower()] = user["id"]
+            return {field: user[field] for field in ("id", "email", "first_name", "last_name", "created_at")}
+
+    def get_user_by_email(self, email: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            user_id = self._users_by_email.get(email.lower())
+            return dict(self.users[user_id]) if user_id is not None else None
+
+    def update_last_login(self, user_id: int) -> None:
+        with self._lock:
+            if user_id in self.users:
+                self.users[user_id]["last_login"] = datetime.now(timezone.utc)
+
+    def update_preferences(self, user_id: int, preferences: Dict[str, Any], fields: List[str]) -> Dict[str, Any]:
+        """Set the given preference fields, creating the user's preferences on first use"""
+        with self._lock:
+            now = datetime.now(timezone.utc)
+            current = self.preferences.get(user_id)
+            if current is None:
+                current = {
+                    "id": len(self.preferences) + 1,
+                    "user_id": user_id,
+                    "email_notifications": False,
+                    "new_job_alerts": False,
+                    "application_updates": False,
+                    "marketing_emails": False,
+                    "saved_searches": [],
+                    "preferred_job_types": [],
+                    "created_at": now,
+                    "updated_at": now
+                }
+                self.preferences[user_id] = current
+            for key, value in preferences.items():
+                if key in fields:
+                    current[key] = value
+            current["updated_at"] = now
+            return dict(current)
+
+    # Saved jobs
+
+    def save_jobs(self, user_id: int, job_ids: List[int]) -> List[Dict[str, Any]]:
+        """
+        Save existing jobs for a user.
+
+        Returns:
+            saved_jobs rows for the requested jobs that exist, with a "created" flag
+        """
+        with self._lock:
+            saved = self.saved_jobs.setdefault(user_id, {})
+            results = []
+            for job_id in job_ids:
+                if job_id not in self.jobs:
+                    continue
+                row = saved.get(job_id)
+                created = row is None
+                if created:
+                    row = {
+                        "id": self._next_saved_id,
+                        "user_id": user_id,
+                        "job_id": job_id,
+                        "saved_at": datetime.now(timezone.utc)
+                    }
+                    self._next_saved_id += 1
+                    saved[job_id] = row
+                results.append({**row, "created": created})
+            if any(row["created"] for row in results):
+                self._bump_saved_jobs_version(user_id)
+            return results
+
+    def unsave_jobs(self, user_id: int, job_ids: List[int]) -> List[int]:
+        """Returns the ids of the jobs that were removed"""
+        with self._lock:
+            saved = self.saved_jobs.get(user_id, {})
+            removed = [job_id for job_id in job_ids if saved.pop(job_id, None) is not None]
+            if removed:
+                self._bump_saved_jobs_version(user_id)
+            return removed
+
+    def _bump_saved_jobs_version(self, user_id: int) -> None:
+        self.saved_jobs_versions[user_id] = self.saved_jobs_versions.get(user_id, 0) + 1
+
+    def saved_jobs_version(self, user_id: int) -> int:
+        with self._lock:
+            return self.saved_jobs_versions.get(user_id, 0)
+
+    def get_saved_jobs(self, user_id: int) -> List[Dict[str, Any]]:
+        """The user's saved jobs with their saved_at time, most recently saved first"""
+        with self._lock:
+            rows = sorted(self.saved_jobs.get(user_id, {}).values(), key=lambda row: row["id"], reverse=True)
+            return [{**self.jobs[row["job_id"]], "saved_at": row["saved_at"]} for row in rows]
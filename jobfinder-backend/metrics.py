@@ -0,0 +1,272 @@
+import bisect
+import functools
+import inspect
+import os
+import threading
+import time
+import logging
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+from dotenv import load_dotenv
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from statements import statements
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Add a Server-Timing header with the stages each API request spent time in
+SERVER_TIMING = os.getenv("SERVER_TIMING", "true").lower() == "true"
+
+# Histogram bucket upper bounds in seconds, from sub-millisecond card parsing to multi-second page loads
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Prometheus histogram of durations in seconds, with one series per label combination.
+
+        Args:
+            name: Metric name
+            documentation: HELP text
+            labelnames: Names of the labels observations are made with
+            buckets: Bucket upper bounds in seconds, ascending
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # label values -> (count per bucket, with +Inf last; sum)
+        self._series: Dict[Tuple[str, ...], Tuple[List[int], List[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float, *labelvalues: str) -> None:
+        index = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            series = self._series.get(labelvalues)
+            if series is None:
+                series = self._series[labelvalues] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][index] += 1
+            series[1][0] += seconds
+
+    def render(self) -> List[str]:
+        """Lines of the histogram in the Prometheus text format"""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((values, list(counts), total[0]) for values, (counts, total) in self._series.items())
+        for values, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                labels = _labels(self.labelnames + ("le",), values + (le,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(self.labelnames, values)} {total:.6f}")
+            lines.append(f"{self.name}_count{_labels(self.labelnames, values)} {cumulative}")
+        return lines
+
+SCRAPE_STAGE_SECONDS = Histogram(
+    "jobfinder_scrape_stage_seconds",
+    "Time spent in each stage of scraping a result page",
+    ("scraper", "stage")
+)
+
+DB_CALL_SECONDS = Histogram(
+    "jobfinder_db_call_seconds",
+    "Time spent in each database layer function",
+    ("layer", "function")
+)
+
+HTTP_REQUEST_SECONDS = Histogram(
+    "jobfinder_http_request_seconds",
+    "Time to serve each API request, until the last byte of streamed responses",
+    ("method", "endpoint", "status")
+)
+
+HISTOGRAMS = [HTTP_REQUEST_SECONDS, SCRAPE_STAGE_SECONDS, DB_CALL_SECONDS]
+
+class RequestTimings:
+    """Time spent per stage while serving one request, for its Server-Timing header"""
+
+    def __init__(self):
+        self._stages: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        with self._lock:
+            self._stages[stage] = self._stages.get(stage, 0.0) + seconds
+
+    def header(self, total: float) -> str:
+        with self._lock:
+            stages = list(self._stages.items())
+        entries = [f"{stage};dur={seconds * 1000:.2f}" for stage, seconds in stages]
+        entries.append(f"total;dur={total * 1000:.2f}")
+        return ", ".join(entries)
+
+# Timings of the request being served; asyncio.to_thread copies the context, so database
+# calls run in worker threads add to the same request
+_request_timings: ContextVar[Optional[RequestTimings]] = ContextVar("request_timings", default=None)
+
+def _record(histogram: Histogram, stage: str, seconds: float, *labelvalues: str) -> None:
+    histogram.observe(seconds, *labelvalues)
+    timings = _request_timings.get()
+    if timings is not None:
+        timings.add(stage, seconds)
+
+@contextmanager
+def scrape_stage(scraper: str, stage: str) -> Iterator[None]:
+    """
+    Time a block as one stage of scraping, e.g. with scrape_stage("selenium", "driver_get").
+
+    Args:
+        scraper: selenium (indeed_scraper.py) or requests (linkedin_scraper.py)
+        stage: Stage name
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        _record(SCRAPE_STAGE_SECONDS, f"scrape.{stage}", time.perf_counter() - start, scraper, stage)
+
+# Whether a database call is being timed in this context. asyncio.to_thread copies it, so
+# calls made inside another one (async fallbacks to database.py, get_jobs wrapping
+# get_jobs_page) stay out of the request's Server-Timing, whose stages then add up
+_in_db_call: ContextVar[bool] = ContextVar("in_db_call", default=False)
+
+def timed_db_call(layer: str) -> Callable[[Callable], Callable]:
+    """
+    Decorator timing every call of a database layer function.
+
+    Every call is observed in jobfinder_db_call_seconds; only calls not made inside
+    another timed call are added to the request's Server-Timing stages.
+
+    Args:
+        layer: sync (database.py) or async (async_database.py)
+    """
+    def decorator(func: Callable) -> Callable:
+        key = (layer, func.__name__)
+        stage = f"db.{func.__name__}" if layer == "sync" else f"db.{func.__name__}.{layer}"
+
+        def observe(seconds: float, nested: bool) -> None:
+            if nested:
+                DB_CALL_SECONDS.observe(seconds, *key)
+            else:
+                _record(DB_CALL_SECONDS, stage, seconds, *key)
+
+        if inspect.iscoroutinefunction(func):
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                nested = _in_db_call.get()
+                token = _in_db_call.set(True)
+                start = time.perf_counter()
+                try:
+                    return await func(*args, **kwargs)
+                finally:
+                    observe(time.perf_counter() - start, nested)
+                    _in_db_call.reset(token)
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nested = _in_db_call.get()
+            token = _in_db_call.set(True)
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(time.perf_counter() - start, nested)
+                _in_db_call.reset(token)
+        return wrapper
+
+    return decorator
+
+def _statement_lines() -> List[str]:
+    """Counters of the prepared statements' calls, errors and time (see statements.py)"""
+    stats = statements.stats()
+    lines = []
+    for metric, key, documentation, scale in (
+        ("jobfinder_db_statement_calls_total", "calls", "Executions of each prepared statement", 1),
+        ("jobfinder_db_statement_errors_total", "errors", "Failed executions of each prepared statement", 1),
+        ("jobfinder_db_statement_seconds_total", "total_ms", "Time spent executing each prepared statement", 1000),
+    ):
+        lines.append(f"# HELP {metric} {documentation}")
+        lines.append(f"# TYPE {metric} counter")
+        for name, values in sorted(stats.items()):
+            lines.append(f"{metric}{_labels(('statement',), (name,))} {_number(values[key] / scale)}")
+    return lines
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format"""
+    lines = []
+    for histogram in HISTOGRAMS:
+        lines.extend(histogram.render())
+    lines.extend(_statement_lines())
+    return "\n".join(lines) + "\n"
+
+class MetricsMiddleware:
+    def __init__(self, app: ASGIApp, server_timing: bool = SERVER_TIMING):
+        """
+        Time API requests and the stages they spend time in.
+
+        Each request's duration is observed in jobfinder_http_request_seconds, and unless
+        server_timing is off the response gets a Server-Timing header listing the scrape
+        stages and database calls made before its headers were sent, e.g.
+        "db.get_saved_jobs.async;dur=1.52, total;dur=2.10".
+
+        Args:
+            app: ASGI application
+            server_timing: Whether to add the Server-Timing header
+        """
+        self.app = app
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _request_timings.set(timings)
+        start = time.perf_counter()
+        status = 500
+
+        async def send_timed(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                if self.server_timing:
+                    # Only the time until the headers are sent can be reported in them
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", timings.header(time.perf_counter() - start))
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_timed)
+        finally:
+            _request_timings.reset(token)
+            # The router records the matched endpoint in the scope; unmatched paths share one series
+            endpoint = scope.get("endpoint")
+            HTTP_REQUEST_SECONDS.observe(
+                time.perf_counter() - start,
+                scope["method"],
+                getattr(endpoint, "__name__", "unmatched"),
+                str(status)
+            )
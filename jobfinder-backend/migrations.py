@@ -0,0 +1,266 @@
+import logging
+from typing import Any, Callable, List, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Text search configuration used to build and query jobs.search_vector.
+# Changing it needs a new migration that recreates the trigger function and the column.
+SEARCH_CONFIG = "english"
+
+# Advisory lock held while migrating, so API processes starting together don't run the same DDL
+MIGRATION_LOCK_KEY = 4827163
+
+# Every migration is written to also apply cleanly to a database created by the
+# unversioned initialize_database() that predates this module, so existing
+# databases are brought up to version by replaying all of them.
+
+def create_tables(cur) -> None:
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS users (
+            id SERIAL PRIMARY KEY,
+            email VARCHAR(255) UNIQUE NOT NULL,
+            password_hash VARCHAR(255) NOT NULL,
+            first_name VARCHAR(100),
+            last_name VARCHAR(100),
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            last_login TIMESTAMP WITH TIME ZONE
+        );
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id SERIAL PRIMARY KEY,
+            title VARCHAR(255) NOT NULL,
+            company VARCHAR(255) NOT NULL,
+            location VARCHAR(255) NOT NULL,
+            description TEXT NOT NULL,
+            salary_range VARCHAR(100),
+            job_type VARCHAR(50),
+            experience_level VARCHAR(50),
+            skills TEXT[],
+            posted_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            link TEXT
+        );
+    """)
+    # Databases created before link was part of the table
+    cur.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS link TEXT;")
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS user_preferences (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+            email_notifications BOOLEAN DEFAULT FALSE,
+            new_job_alerts BOOLEAN DEFAULT FALSE,
+            application_updates BOOLEAN DEFAULT FALSE,
+            marketing_emails BOOLEAN DEFAULT FALSE,
+            saved_searches JSONB,
+            preferred_job_types TEXT[],
+            created_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+        );
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS saved_jobs (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+            job_id INTEGER REFERENCES jobs(id) ON DELETE CASCADE,
+            saved_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(user_id, job_id)
+        );
+    """)
+
+    cur.execute("""
+        CREATE TABLE IF NOT EXISTS job_applications (
+            id SERIAL PRIMARY KEY,
+            user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+            job_id INTEGER REFERENCES jobs(id) ON DELETE CASCADE,
+            status VARCHAR(50) DEFAULT 'applied',
+            applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            updated_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP,
+            UNIQUE(user_id, job_id)
+        );
+    """)
+
+def add_job_identity_index(cur) -> None:
+    # Natural job identity used to deduplicate scraped jobs
+    cur.execute("SELECT to_regclass('jobs_title_company_location_key') AS index_name")
+    if cur.fetchone()["index_name"] is None:
+        # Keep the oldest copy of any duplicate rows so the unique index can be built.
+        # Saved jobs and applications cascade on delete, so they are moved to the kept
+        # copy first; where a user already has a row for it, the duplicate row is dropped.
+        cur.execute("""
+            CREATE TEMPORARY TABLE job_duplicates ON COMMIT DROP AS
+            SELECT id, keeper FROM (
+                SELECT id, min(id) OVER (PARTITION BY title, company, location) AS keeper
+                FROM jobs
+            ) jobs_by_identity
+            WHERE id <> keeper;
+        """)
+        for table in ("saved_jobs", "job_applications"):
+            # Of the rows of one user that end up on the same kept job, keep the one
+            # already on it, else the oldest
+            cur.execute(f"""
+                DELETE FROM {table} child USING job_duplicates d
+                WHERE child.job_id = d.id
+                  AND EXISTS (
+                      SELECT 1 FROM {table} other
+                      LEFT JOIN job_duplicates od ON od.id = other.job_id
+                      WHERE other.user_id = child.user_id
+                        AND COALESCE(od.keeper, other.job_id) = d.keeper
+                        AND (other.job_id = d.keeper OR other.id < child.id)
+                  );
+            """)
+            cur.execute(f"""
+                UPDATE {table} child SET job_id = d.keeper
+                FROM job_duplicates d
+                WHERE child.job_id = d.id;
+            """)
+            if cur.rowcount:
+                logger.info(f"Moved {cur.rowcount} {table} rows to the kept copy of duplicate jobs")
+        cur.execute("DELETE FROM jobs USING job_duplicates d WHERE jobs.id = d.id;")
+        if cur.rowcount:
+            logger.info(f"Removed {cur.rowcount} duplicate jobs")
+        cur.execute("""
+            CREATE UNIQUE INDEX jobs_title_company_location_key
+            ON jobs (title, company, location);
+        """)
+
+def add_salary_columns(cur) -> None:
+    # Annual salary bounds parsed from salary_range at ingest
+    cur.execute("""
+        ALTER TABLE jobs
+            ADD COLUMN IF NOT EXISTS salary_min INTEGER,
+            ADD COLUMN IF NOT EXISTS salary_max INTEGER,
+            ADD COLUMN IF NOT EXISTS salary_period VARCHAR(10);
+    """)
+    cur.execute("CREATE INDEX IF NOT EXISTS jobs_salary_min_idx ON jobs (salary_min);")
+    cur.execute("CREATE INDEX IF NOT EXISTS jobs_salary_max_idx ON jobs (salary_max);")
+
+def add_search_vector(cur) -> None:
+    # Full-text search document: title ranks above skills, skills above description
+    cur.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS search_vector tsvector;")
+    cur.execute(f"""
+        CREATE OR REPLACE FUNCTION jobs_search_vector_update() RETURNS trigger AS $$
+        BEGIN
+            NEW.search_vector :=
+                setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.title, '')), 'A') ||
+                setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(array_to_string(NEW.skills, ' '), '')), 'B') ||
+                setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(NEW.description, '')), 'C');
+            RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql;
+    """)
+    cur.execute("DROP TRIGGER IF EXISTS jobs_search_vector_trigger ON jobs;")
+    cur.execute("""
+        CREATE TRIGGER jobs_search_vector_trigger
+        BEFORE INSERT OR UPDATE OF title, description, skills ON jobs
+        FOR EACH ROW EXECUTE FUNCTION jobs_search_vector_update();
+    """)
+    # Fill the column for rows stored before it existed; touching title fires the trigger
+    cur.execute("UPDATE jobs SET title = title WHERE search_vector IS NULL;")
+    cur.execute("CREATE INDEX IF NOT EXISTS jobs_search_vector_idx ON jobs USING GIN (search_vector);")
+
+def add_listing_index(cur) -> None:
+    # Serves the newest-first listing and its (posted_at, id) keyset pages,
+    # and any other lookup or range scan on posted_at alone
+    cur.execute("CREATE INDEX IF NOT EXISTS jobs_posted_at_id_idx ON jobs (posted_at DESC, id DESC);")
+
+def add_lookup_indexes(cur) -> None:
+    # A user's saved jobs, newest first, without sorting
+    cur.execute("CREATE INDEX IF NOT EXISTS saved_jobs_user_id_saved_at_idx ON saved_jobs (user_id, saved_at DESC);")
+    # Case-insensitive login and registration lookups
+    cur.execute("CREATE INDEX IF NOT EXISTS users_email_lower_idx ON users (lower(email));")
+
+def add_saved_jobs_version(cur) -> None:
+    # Bumped by every save and unsave that changes a user's saved jobs; the saved jobs
+    # list's ETag is built from it
+    cur.execute("ALTER TABLE users ADD COLUMN IF NOT EXISTS saved_jobs_version INTEGER NOT NULL DEFAULT 0;")
+
+# (version, description, apply) in the order they are applied. Append new migrations
+# with the next version number; never edit or reorder one that has been released.
+MIGRATIONS: List[Tuple[int, str, Callable[[Any], None]]] = [
+    (1, "Create tables", create_tables),
+    (2, "Unique index on job title, company and location", add_job_identity_index),
+    (3, "Annual salary columns", add_salary_columns),
+    (4, "Full-text search vector", add_search_vector),
+    (5, "Index on posted_at and id for job listings", add_listing_index),
+    (6, "Indexes for saved jobs and email lookups", add_lookup_indexes),
+    (7, "Saved jobs version counter on users", add_saved_jobs_version),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+def current_version(cur) -> int:
+    """
+    Get the schema version recorded in the database.
+
+    Args:
+        cur: Cursor returning rows as dictionaries
+
+    Returns:
+        Highest applied migration version, 0 for a database that was never migrated
+    """
+    cur.execute("SELECT to_regclass('schema_migrations') AS table_name")
+    if cur.fetchone()["table_name"] is None:
+        return 0
+    cur.execute("SELECT COALESCE(MAX(version), 0) AS version FROM schema_migrations")
+    return cur.fetchone()["version"]
+
+def migrate(conn, cur) -> int:
+    """
+    Apply the migrations the database hasn't seen yet.
+
+    A database that is already at the latest version costs two catalog lookups and
+    no DDL. Each migration commits together with its schema_migrations row, so a
+    failed migration is retried from that step on the next start.
+
+    Args:
+        conn: Database connection
+        cur: Cursor of conn returning rows as dictionaries
+
+    Returns:
+        Number of migrations applied
+    """
+    version = current_version(cur)
+    conn.commit()
+    if version >= LATEST_VERSION:
+        logger.info(f"Database schema is up to date (version {version})")
+        return 0
+
+    cur.execute("SELECT pg_advisory_lock(%s)", (MIGRATION_LOCK_KEY,))
+    applied = 0
+    try:
+        cur.execute("""
+            CREATE TABLE IF NOT EXISTS schema_migrations (
+                version INTEGER PRIMARY KEY,
+                description TEXT NOT NULL,
+                applied_at TIMESTAMP WITH TIME ZONE DEFAULT CURRENT_TIMESTAMP
+            );
+        """)
+        conn.commit()
+
+        # Another process may have migrated while we waited for the lock
+        version = current_version(cur)
+        for number, description, apply in MIGRATIONS:
+            if number <= version:
+                continue
+            logger.info(f"Applying migration {number}: {description}")
+            apply(cur)
+            cur.execute(
+                "INSERT INTO schema_migrations (version, description) VALUES (%s, %s)",
+                (number, description)
+            )
+            conn.commit()
+            applied += 1
+    except Exception:
+        conn.rollback()
+        raise
+    finally:
+        cur.execute("SELECT pg_advisory_unlock(%s)", (MIGRATION_LOCK_KEY,))
+        conn.commit()
+
+    logger.info(f"Applied {applied} migration(s); database schema is at version {LATEST_VERSION}")
+    return applied
@@ -0,0 +1,167 @@
+import asyncio
+import os
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, Optional, Tuple
+from dotenv import load_dotenv
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# "memory" shares buckets between threads of this process, "sqlite" between all processes on the node
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+
+# Database file used by the sqlite backend
+RATE_LIMIT_PATH = os.getenv("RATE_LIMIT_PATH", "rate_limits.db")
+
+# Default sustained request rate and burst allowance per host
+RATE_LIMIT_RPS = float(os.getenv("RATE_LIMIT_RPS", "0.5"))
+RATE_LIMIT_BURST = float(os.getenv("RATE_LIMIT_BURST", "3"))
+
+class MemoryBucketStore:
+    """Token bucket state kept in this process"""
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, float]] = {}  # host -> (tokens, updated_at)
+        self._lock = threading.Lock()
+
+    def reserve(self, host: str, rate: float, burst: float) -> float:
+        with self._lock:
+            now = time.time()
+            tokens, updated_at = self._buckets.get(host, (burst, now))
+            tokens = min(burst, tokens + (now - updated_at) * rate) - 1
+            self._buckets[host] = (tokens, now)
+        return _wait_for(tokens, rate)
+
+class SQLiteBucketStore:
+    """Token bucket state kept in a local SQLite file shared by every process on the node"""
+
+    def __init__(self, path: str = RATE_LIMIT_PATH):
+        self.path = path
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS rate_limit_buckets (
+                    host TEXT PRIMARY KEY,
+                    tokens REAL NOT NULL,
+                    updated_at REAL NOT NULL
+                )
+            """)
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    def reserve(self, host: str, rate: float, burst: float) -> float:
+        conn = self._connect()
+        try:
+            # BEGIN IMMEDIATE takes the write lock up front, so the read-modify-write is atomic
+            conn.execute("BEGIN IMMEDIATE")
+            now = time.time()
+            row = conn.execute(
+                "SELECT tokens, updated_at FROM rate_limit_buckets WHERE host = ?", (host,)
+            ).fetchone()
+            tokens, updated_at = row if row else (burst, now)
+            tokens = min(burst, tokens + max(0.0, now - updated_at) * rate) - 1
+            conn.execute(
+                "INSERT OR REPLACE INTO rate_limit_buckets (host, tokens, updated_at) VALUES (?, ?, ?)",
+                (host, tokens, now)
+            )
+            conn.execute("COMMIT")
+        except sqlite3.Error:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            raise
+        finally:
+            conn.close()
+        return _wait_for(tokens, rate)
+
+def _wait_for(tokens: float, rate: float) -> float:
+    """Seconds until a reservation that left the bucket at `tokens` may proceed"""
+    if tokens >= 0 or rate <= 0:
+        return 0.0
+    return -tokens / rate
+
+class RateLimiter:
+    def __init__(self, rate: float = RATE_LIMIT_RPS, burst: float = RATE_LIMIT_BURST, store=None):
+        """
+        Per-host token bucket rate limiter.
+
+        Each request takes one token; tokens refill at `rate` per second up to `burst`.
+        A request that finds the bucket empty still reserves its token and waits until
+        it would have been refilled, so concurrent callers queue up in order.
+
+        Args:
+            rate: Sustained requests per second allowed per host
+            burst: Requests allowed back to back after an idle period
+            store: Bucket state backend (defaults to MemoryBucketStore)
+        """
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self.store = store or MemoryBucketStore()
+        self._limits: Dict[str, Tuple[float, float]] = {}
+
+    def configure(self, host: str, rate: float, burst: Optional[float] = None) -> None:
+        """Override the rate and burst allowance for one host"""
+        self._limits[host] = (rate, max(1.0, burst if burst is not None else self.burst))
+
+    def _reserve(self, host: str) -> float:
+        rate, burst = self._limits.get(host, (self.rate, self.burst))
+        try:
+            return self.store.reserve(host, rate, burst)
+        except sqlite3.Error as e:
+            # Don't stop scraping because the shared state is unavailable; fall back to the plain rate
+            logger.error(f"Error reserving rate limit token for {host}: {e}")
+            return 1.0 / rate if rate > 0 else 0.0
+
+    def acquire(self, host: str) -> float:
+        """
+        Take a token for host, sleeping until one is available.
+
+        Returns:
+            Seconds spent waiting
+        """
+        wait = self._reserve(host)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+    async def acquire_async(self, host: str) -> float:
+        """
+        Take a token for host, waiting without blocking the event loop.
+
+        Returns:
+            Seconds spent waiting
+        """
+        # The sqlite store takes a write lock with a busy timeout, so reserve off the event loop
+        wait = await asyncio.to_thread(self._reserve, host)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        return wait
+
+# Singleton instance
+_rate_limiter = None
+_rate_limiter_lock = threading.Lock()
+
+def get_rate_limiter() -> RateLimiter:
+    """Get or create the rate limiter for the configured backend"""
+    global _rate_limiter
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            store = None
+            if RATE_LIMIT_BACKEND == "sqlite":
+                try:
+                    store = SQLiteBucketStore()
+                except sqlite3.Error as e:
+                    logger.error(f"Error opening rate limit state at {RATE_LIMIT_PATH}: {e}")
+                    logger.info("Falling back to in-process rate limiting")
+            _rate_limiter = RateLimiter(store=store)
+    return _rate_limiter
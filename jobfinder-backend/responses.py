@@ -0,0 +1,197 @@
+import gzip
+import hashlib
+import json
+import os
+import logging
+from datetime import date, datetime, time
+from decimal import Decimal
+from typing import Any, Optional
+from uuid import UUID
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import JSONResponse, Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+# Try to import orjson, but fall back to the json module if it's not available
+try:
+    import orjson
+    HAS_ORJSON = True
+except ImportError:
+    HAS_ORJSON = False
+
+# Try to import brotli, but only offer gzip if it's not available
+try:
+    import brotli
+    HAS_BROTLI = True
+except ImportError:
+    HAS_BROTLI = False
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Smallest response body worth compressing, in bytes
+COMPRESSION_MIN_SIZE = int(os.getenv("COMPRESSION_MIN_SIZE", "1024"))
+
+# Compression levels; low levels already shrink job lists about fivefold at a fraction of the CPU
+# of higher ones (see bench_responses.py)
+GZIP_LEVEL = int(os.getenv("GZIP_LEVEL", "1"))
+BROTLI_QUALITY = int(os.getenv("BROTLI_QUALITY", "4"))
+
+# Content types that compress well; anything else (images, already compressed data) is sent as is
+COMPRESSIBLE_TYPES = ("application/json", "text/")
+
+def _default(value: Any) -> Any:
+    """Encode the values orjson and json can't, the way FastAPI's jsonable_encoder does"""
+    if isinstance(value, Decimal):
+        # Whole numbers stay integers
+        return int(value) if value.as_tuple().exponent >= 0 else float(value)
+    if isinstance(value, (datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def dumps(content: Any) -> bytes:
+    """
+    Serialize content to compact UTF-8 JSON.
+
+    Dictionaries (including psycopg2's RealDictRow), lists, datetimes and UUIDs are encoded
+    natively by orjson; Decimals become numbers.
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode()
+
+class FastJSONResponse(JSONResponse):
+    """
+    JSON response serialized with orjson.
+
+    Returning it from an endpoint skips FastAPI's jsonable_encoder, which walks every field
+    of every job before the response is rendered.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+def make_etag(*parts: Any) -> str:
+    """
+    Weak ETag from a content version, e.g. W/"saved-7-12" for make_etag("saved", 7, 12).
+
+    ETags are weak because the same version is sent in different encodings by
+    CompressionMiddleware.
+    """
+    return 'W/"' + "-".join(str(part) for part in parts) + '"'
+
+def content_etag(content: Any) -> str:
+    """Weak ETag from a hash of content serialized as JSON, for content fixed at startup"""
+    return make_etag(hashlib.sha1(dumps(content)).hexdigest()[:16])
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Check an If-None-Match header against the current ETag, with the weak comparison
+    conditional GETs use.
+    """
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    current = etag.removeprefix("W/")
+    return any(tag.strip().removeprefix("W/") == current for tag in if_none_match.split(","))
+
+def not_modified(etag: str, headers: Optional[dict] = None) -> Response:
+    """304 response for a conditional GET whose ETag still matches"""
+    return Response(status_code=304, headers={"ETag": etag, **(headers or {})})
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    Pick the response encoding from an Accept-Encoding header: br if available and
+    accepted, otherwise gzip, otherwise None.
+    """
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+
+    for encoding in (("br", "gzip") if HAS_BROTLI else ("gzip",)):
+        if accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return None
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    return gzip.compress(body, compresslevel=GZIP_LEVEL)
+
+class CompressionMiddleware:
+    def __init__(self, app: ASGIApp, minimum_size: int = COMPRESSION_MIN_SIZE):
+        """
+        Compress response bodies with brotli or gzip, as negotiated with each request's
+        Accept-Encoding header.
+
+        Only complete bodies are compressed. Streaming responses (NDJSON and Server-Sent
+        Events searches) pass through untouched so each job still reaches the client as
+        soon as it is sent.
+
+        Args:
+            app: ASGI application
+            minimum_size: Smallest body, in bytes, that is compressed
+        """
+        self.app = app
+        self.minimum_size = minimum_size
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(Headers(scope=scope).get("accept-encoding", ""))
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Optional[Message] = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start
+
+            # Hold the headers back until the first body chunk shows whether to compress
+            if message["type"] == "http.response.start":
+                start = message
+                return
+
+            if message["type"] == "http.response.body" and start is not None:
+                headers = MutableHeaders(raw=start["headers"])
+                body = message.get("body", b"")
+                if (
+                    message.get("more_body", False)
+                    or len(body) < self.minimum_size
+                    or "content-encoding" in headers
+                    or not headers.get("content-type", "").startswith(COMPRESSIBLE_TYPES)
+                ):
+                    await send(start)
+                    start = None
+                    await send(message)
+                    return
+
+                body = compress(body, encoding)
+                headers["Content-Encoding"] = encoding
+                headers["Content-Length"] = str(len(body))
+                headers.add_vary_header("Accept-Encoding")
+                await send(start)
+                start = None
+                await send({"type": "http.response.body", "body": body})
+                return
+
+            await send(message)
+
+        await self.app(scope, receive, send_compressed)
@@ -0,0 +1,215 @@
+import asyncio
+import os
+import threading
+import logging
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, List, Optional, Tuple
+from dotenv import load_dotenv
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Scrapes run at once in the API process; each holds a pooled Chrome driver, so this matches the driver pool
+SCRAPE_EXECUTOR_WORKERS = int(os.getenv("SCRAPE_EXECUTOR_WORKERS", os.getenv("DRIVER_POOL_SIZE", "2")))
+
+# Distinct searches running or waiting for a worker before new ones are refused
+SCRAPE_MAX_FLIGHTS = int(os.getenv("SCRAPE_MAX_FLIGHTS", "20"))
+
+class TooManyFlightsError(Exception):
+    """Raised when a new search would exceed SCRAPE_MAX_FLIGHTS."""
+
+class Flight:
+    def __init__(self, key: str):
+        """
+        One in-flight scrape and the results it has produced so far.
+
+        The scrape runs in a worker thread and appends results as they are parsed;
+        any number of subscribers read them from the start, each at its own pace,
+        while waiting on the event loop rather than holding a thread. When the last
+        subscriber leaves, the flight is cancelled and the scrape stops before loading
+        another page.
+        """
+        self.key = key
+        self.results: List[Any] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self.subscribers = 0
+        self.cancelled = False
+        self._waiters: List[Tuple[asyncio.AbstractEventLoop, asyncio.Event]] = []
+        self._lock = threading.Lock()
+
+    def _wake(self) -> None:
+        # Called with the lock held
+        for loop, event in self._waiters:
+            loop.call_soon_threadsafe(event.set)
+        self._waiters = []
+
+    def publish(self, result: Any) -> None:
+        with self._lock:
+            self.results.append(result)
+            self._wake()
+
+    def finish(self, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            self.done = True
+            self.error = error
+            self._wake()
+
+    def leave(self) -> None:
+        """Drop a subscriber, cancelling the scrape if it was the last one"""
+        with self._lock:
+            self.subscribers -= 1
+            if self.subscribers <= 0 and not self.done:
+                self.cancelled = True
+
+    async def subscribe(self) -> AsyncIterator[Any]:
+        """
+        Yield every result of the scrape, including those published before subscribing.
+
+        Each subscription holds the subscriber counted by ScrapeFlights.join and drops it
+        when it ends, whether the scrape finished or the client went away.
+
+        Raises:
+            Exception: The exception the scrape failed with, after its last result
+        """
+        loop = asyncio.get_running_loop()
+        position = 0
+        try:
+            while True:
+                event = asyncio.Event()
+                with self._lock:
+                    batch = self.results[position:]
+                    position += len(batch)
+                    done, error = self.done, self.error
+                    if not batch and not done:
+                        self._waiters.append((loop, event))
+
+                for result in batch:
+                    yield result
+                if batch:
+                    continue
+                if done:
+                    if error is not None:
+                        raise error
+                    return
+                await event.wait()
+        finally:
+            self.leave()
+
+class ScrapeFlights:
+    def __init__(self, max_workers: int = SCRAPE_EXECUTOR_WORKERS, max_flights: int = SCRAPE_MAX_FLIGHTS):
+        """
+        Runs scrapes on a bounded thread pool and coalesces identical searches.
+
+        A search that is already being scraped is joined instead of starting another
+        browser crawl, so concurrent requests for the same normalized query share one
+        scrape and its results. Searches beyond max_workers wait for a free worker;
+        beyond max_flights they are refused.
+
+        Args:
+            max_workers: Scrapes run at once
+            max_flights: Distinct searches running or waiting at once
+        """
+        self.max_flights = max_flights
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="scrape-flight")
+        self._flights: Dict[str, Flight] = {}
+        self._futures: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def join(self, key: str, scrape: Callable[[], Iterable[Any]]) -> Flight:
+        """
+        Join the in-flight scrape for key, or start one.
+
+        Args:
+            key: Normalized query (see search_cache.normalize_query)
+            scrape: Callable returning the results of the search, run in a worker thread
+
+        Returns:
+            The flight to subscribe to
+
+        Raises:
+            TooManyFlightsError: If the search would start a scrape while max_flights are in flight
+        """
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                with flight._lock:
+                    # A cancelled flight is stopping early, so its results would be cut short
+                    joined = not flight.cancelled
+                    if joined:
+                        flight.subscribers += 1
+                if joined:
+                    logger.info(f"Joined in-flight scrape for {key} ({flight.subscribers} subscribers)")
+                    return flight
+                del self._flights[key]
+                del self._futures[key]
+
+            if len(self._flights) >= self.max_flights:
+                raise TooManyFlightsError(f"{len(self._flights)} searches are already in flight")
+
+            flight = Flight(key)
+            flight.subscribers = 1
+            self._flights[key] = flight
+            self._futures[key] = self._executor.submit(self._run, flight, scrape)
+            return flight
+
+    def _run(self, flight: Flight, scrape: Callable[[], Iterable[Any]]) -> None:
+        results = None
+        try:
+            # Searches abandoned while waiting for a worker aren't scraped at all
+            if not flight.cancelled:
+                results = scrape()
+                for result in results:
+                    flight.publish(result)
+                    if flight.cancelled:
+                        logger.info(f"Stopping scrape for {flight.key}: no subscribers left")
+                        break
+        except Exception as e:
+            logger.error(f"Scrape failed for {flight.key}: {e}")
+            flight.finish(e)
+        else:
+            flight.finish()
+        finally:
+            # Closing a generator stops its source before the next page (see SearchPlan.scrape)
+            if hasattr(results, "close"):
+                results.close()
+            # Later searches start a new scrape, which the search cache usually answers
+            with self._lock:
+                if self._flights.get(flight.key) is flight:
+                    del self._flights[flight.key]
+                    del self._futures[flight.key]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._flights)
+
+    def shutdown(self) -> None:
+        """Stop accepting scrapes and fail those still waiting for a worker"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        with self._lock:
+            for key, future in list(self._futures.items()):
+                if future.cancelled():
+                    self._flights.pop(key).finish(RuntimeError("Scraping stopped"))
+                    del self._futures[key]
+
+_flights = None
+_flights_lock = threading.Lock()
+
+def get_flights() -> ScrapeFlights:
+    """Get or create the scrape executor of this process"""
+    global _flights
+    with _flights_lock:
+        if _flights is None:
+            _flights = ScrapeFlights()
+    return _flights
+
+def shutdown_flights() -> None:
+    global _flights
+    with _flights_lock:
+        if _flights is not None:
+            _flights.shutdown()
+            _flights = None
@@ -0,0 +1,209 @@
+import multiprocessing
+import queue
+import signal
+import sys
+import threading
+import time
+import os
+import logging
+from typing import Dict, List, Optional
+from dotenv import load_dotenv
+from search_cache import SEARCH_CACHE_BACKEND, get_cache, normalize_query
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Number of background scrape worker processes (0 disables scraping from the API)
+SCRAPE_WORKERS = int(os.getenv("SCRAPE_WORKERS", "1"))
+
+# Maximum number of pending scrape requests before new ones are dropped
+SCRAPE_QUEUE_SIZE = int(os.getenv("SCRAPE_QUEUE_SIZE", "100"))
+
+# Concurrent scrapes per worker process (one per pooled Chrome driver)
+SCRAPE_THREADS_PER_WORKER = int(os.getenv("DRIVER_POOL_SIZE", "2"))
+
+# Minimum number of seconds between two refreshes of the same query
+SCRAPE_REFRESH_INTERVAL = int(os.getenv("SCRAPE_REFRESH_INTERVAL", "900"))
+
+# Default number of jobs scraped per refresh
+DEFAULT_LIMIT = 25
+
+# Worker processes are spawned rather than forked so each one starts with a clean
+# interpreter and its own Chrome driver
+_context = multiprocessing.get_context("spawn")
+
+_task_queue = None
+_workers = []
+
+# Last enqueue time per query key, used to avoid refreshing the same query repeatedly
+_last_enqueued: Dict[str, float] = {}
+_lock = threading.Lock()
+
+def _run_tasks(task_queue) -> None:
+    """
+    Run scrape requests from the queue until a None sentinel is received.
+    Scraped jobs are written to the jobs table by the scraper itself.
+    """
+    # Imported here so the API process never loads Selenium
+    from indeed_scraper import search_jobs
+
+    while True:
+        task = task_queue.get()
+        if task is None:
+            break
+
+        try:
+            logger.info(f"Scrape worker refreshing: {task}")
+            jobs = search_jobs(**task)
+            logger.info(f"Scrape worker stored {len(jobs)} jobs for: {task}")
+        except Exception as e:
+            logger.error(f"Scrape worker failed for {task}: {e}")
+
+def _worker_loop(task_queue, threads: int) -> None:
+    """
+    Entry point of a worker process. Runs one consumer thread per pooled Chrome
+    driver so a single process can scrape several queries in parallel.
+
+    The Chrome drivers are quit when the consumers exit, and also when stop_workers
+    terminates the process because a scrape outlasted its timeout.
+    """
+    def terminate(signum, frame):
+        # Raised in the main thread, which is waiting on the consumers below
+        raise SystemExit(0)
+
+    signal.signal(signal.SIGTERM, terminate)
+
+    # Daemon threads, so a terminated worker exits without waiting for scrapes in progress
+    consumers = [
+        threading.Thread(target=_run_tasks, args=(task_queue,), name=f"scrape-consumer-{i + 1}", daemon=True)
+        for i in range(max(1, threads))
+    ]
+    try:
+        for consumer in consumers:
+            consumer.start()
+        for consumer in consumers:
+            consumer.join()
+    finally:
+        # Only consumers that ran a scrape have loaded the scraper and its pool
+        scraper = sys.modules.get("indeed_scraper")
+        if scraper is not None:
+            scraper.close_pool()
+
+def start_workers(count: int = SCRAPE_WORKERS) -> None:
+    """
+    Start the background scrape worker processes.
+
+    Args:
+        count: Number of worker processes to start
+    """
+    global _task_queue
+
+    if _workers or count <= 0:
+        return
+
+    _task_queue = _context.Queue(maxsize=SCRAPE_QUEUE_SIZE)
+
+    for i in range(count):
+        worker = _context.Process(
+            target=_worker_loop,
+            args=(_task_queue, SCRAPE_THREADS_PER_WORKER),
+            name=f"scrape-worker-{i + 1}",
+            daemon=True
+        )
+        worker.start()
+        _workers.append(worker)
+
+    logger.info(f"Started {count} scrape worker(s)")
+
+def stop_workers(timeout: float = 10.0) -> None:
+    """
+    Stop the background scrape worker processes.
+
+    Args:
+        timeout: Seconds to wait for each worker to exit before terminating it
+    """
+    global _task_queue
+
+    if not _workers:
+        return
+
+    for _ in range(len(_workers) * max(1, SCRAPE_THREADS_PER_WORKER)):
+        try:
+            _task_queue.put_nowait(None)
+        except queue.Full:
+            pass
+
+    for worker in _workers:
+        worker.join(timeout)
+        if worker.is_alive():
+            # The worker quits its Chrome drivers on SIGTERM before exiting
+            worker.terminate()
+            worker.join(timeout)
+
+    _workers.clear()
+    _task_queue = None
+    logger.info("Scrape workers stopped")
+
+def enqueue_refresh(keywords: Optional[List[str]] = None,
+                    location: Optional[str] = None,
+                    categories: Optional[List[str]] = None,
+                    limit: int = DEFAULT_LIMIT,
+                    filters: Optional[Dict[str, str]] = None) -> bool:
+    """
+    Queue a background scrape for a search unless it was refreshed recently
+    or its results are still fresh in the search cache.
+
+    The search cache is only checked with SEARCH_CACHE_BACKEND=sqlite, the one backend
+    shared with the worker processes; the memory cache of this process isn't where
+    the workers store their results.
+
+    Args:
+        keywords: List of search keywords
+        location: Location to search in
+        categories: List of categories from SEARCH_TERM_DICT
+        limit: Maximum number of jobs to scrape
+        filters: Filters applied by the scraper (see search_pipeline.SearchPlan.source_filters)
+
+    Returns:
+        True if a refresh was queued, False otherwise
+    """
+    if _task_queue is None:
+        return False
+
+    key = normalize_query(keywords, location, categories, limit, filters)
+    now = time.time()
+
+    # Results still fresh in the shared search cache do not need scraping again
+    if SEARCH_CACHE_BACKEND == "sqlite" and get_cache().contains(key):
+        return False
+
+    with _lock:
+        last = _last_enqueued.get(key)
+        if last is not None and now - last < SCRAPE_REFRESH_INTERVAL:
+            return False
+
+        try:
+            _task_queue.put_nowait({
+                "keywords": keywords,
+                "location": location,
+                "categories": categories,
+                "limit": limit,
+                "filters": filters
+            })
+        except queue.Full:
+            logger.warning(f"Scrape queue full, dropping refresh for: {key}")
+            return False
+
+        _last_enqueued[key] = now
+
+        # Forget queries whose refresh interval has passed so the map stays bounded
+        if len(_last_enqueued) > SCRAPE_QUEUE_SIZE * 100:
+            for stale_key in [k for k, t in _last_enqueued.items() if now - t >= SCRAPE_REFRESH_INTERVAL]:
+                del _last_enqueued[stale_key]
+
+    logger.info(f"Queued scrape refresh for: {key}")
+    return True
@@ -0,0 +1,295 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+import logging
+from collections import OrderedDict
+from typing import Dict, List, Optional, Any
+from dotenv import load_dotenv
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# "memory" keeps results in this process, "sqlite" shares them between processes on the node
+SEARCH_CACHE_BACKEND = os.getenv("SEARCH_CACHE_BACKEND", "memory").lower()
+
+# Seconds a cached search result stays fresh
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "600"))
+
+# Upper bound on the serialized size of all cached results
+SEARCH_CACHE_MAX_BYTES = int(os.getenv("SEARCH_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# Database file used by the sqlite backend
+SEARCH_CACHE_PATH = os.getenv("SEARCH_CACHE_PATH", "search_cache.db")
+
+def normalize_query(keywords: Optional[List[str]] = None,
+                    location: Optional[str] = None,
+                    categories: Optional[List[str]] = None,
+                    limit: int = 25,
+                    filters: Optional[Dict[str, str]] = None) -> str:
+    """
+    Build a normalized key identifying a search.
+
+    Keywords are lowercased and re-split on whitespace, the location is trimmed and
+    lowercased, and categories are deduplicated and sorted, so equivalent searches
+    share one key.
+
+    Args:
+        keywords: List of search keywords
+        location: Location to search in
+        categories: List of categories from SEARCH_TERM_DICT
+        limit: Maximum number of jobs returned
+        filters: Filters applied by the source (like job_type), if any
+
+    Returns:
+        Cache key as a string
+    """
+    key = [
+        " ".join(" ".join(keywords or []).lower().split()),
+        " ".join((location or "").lower().split()),
+        sorted(set(cat.lower() for cat in (categories or []) if cat)),
+        limit
+    ]
+    # Unfiltered searches keep the keys they had before filters existed
+    if filters:
+        key.append(sorted((name, value) for name, value in filters.items() if value))
+    return json.dumps(key)
+
+class MemoryCache:
+    def __init__(self, ttl: int = SEARCH_CACHE_TTL, max_bytes: int = SEARCH_CACHE_MAX_BYTES):
+        """
+        In-process TTL + LRU cache of search results.
+
+        Values are stored serialized, which keeps the size accounting exact and
+        prevents callers from mutating cached results.
+
+        Args:
+            ttl: Seconds an entry stays fresh
+            max_bytes: Maximum total size of the serialized entries
+        """
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # key -> (expires_at, payload)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _remove(self, key: str) -> None:
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= time.time():
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            payload = entry[1]
+
+        return json.loads(payload)
+
+    def contains(self, key: str) -> bool:
+        """Check for a fresh entry without touching counters or LRU order."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and entry[0] > time.time()
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting least recently used entries to stay within max_bytes."""
+        payload = json.dumps(value, default=str)
+        if len(payload) > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.time() + self.ttl, payload)
+            self._bytes += len(payload)
+
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters and current size of the cache."""
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes
+            }
+
+class SQLiteCache:
+    def __init__(self, path: str = SEARCH_CACHE_PATH, ttl: int = SEARCH_CACHE_TTL,
+                 max_bytes: int = SEARCH_CACHE_MAX_BYTES):
+        """
+        TTL + LRU cache of search results in a local SQLite file, shared by every
+        process on the node (uvicorn workers and scrape workers).
+
+        Hit/miss counters are kept per process; the stored entries are shared.
+
+        Args:
+            path: Path of the SQLite database file
+            ttl: Seconds an entry stays fresh
+            max_bytes: Maximum total size of the serialized entries
+        """
+        self.path = path
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS search_cache (
+                    key TEXT PRIMARY KEY,
+                    payload TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS search_cache_last_access ON search_cache (last_access)")
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5, isolation_level=None)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired."""
+        now = time.time()
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT payload FROM search_cache WHERE key = ? AND expires_at > ?",
+                (key, now)
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE search_cache SET last_access = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            logger.error(f"Error reading search cache: {e}")
+            row = None
+        finally:
+            conn.close()
+
+        with self._lock:
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+
+        return json.loads(row[0])
+
+    def contains(self, key: str) -> bool:
+        """Check for a fresh entry without touching counters or LRU order."""
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT 1 FROM search_cache WHERE key = ? AND expires_at > ?",
+                (key, time.time())
+            ).fetchone()
+            return row is not None
+        except sqlite3.Error as e:
+            logger.error(f"Error reading search cache: {e}")
+            return False
+        finally:
+            conn.close()
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting expired and least recently used entries to stay within max_bytes."""
+        payload = json.dumps(value, default=str)
+        if len(payload) > self.max_bytes:
+            return
+
+        now = time.time()
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT OR REPLACE INTO search_cache (key, payload, size, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, len(payload), now + self.ttl, now)
+            )
+            conn.execute("DELETE FROM search_cache WHERE expires_at <= ?", (now,))
+
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM search_cache").fetchone()[0]
+            evicted = 0
+            if total > self.max_bytes:
+                rows = conn.execute("SELECT key, size FROM search_cache ORDER BY last_access").fetchall()
+                for old_key, size in rows:
+                    if total <= self.max_bytes:
+                        break
+                    conn.execute("DELETE FROM search_cache WHERE key = ?", (old_key,))
+                    total -= size
+                    evicted += 1
+            conn.execute("COMMIT")
+        except sqlite3.Error as e:
+            logger.error(f"Error writing search cache: {e}")
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            evicted = 0
+        finally:
+            conn.close()
+
+        with self._lock:
+            self.evictions += evicted
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters of this process and current size of the shared cache."""
+        conn = self._connect()
+        try:
+            entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM search_cache").fetchone()
+        except sqlite3.Error:
+            entries, size = 0, 0
+        finally:
+            conn.close()
+
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": entries,
+                "bytes": size
+            }
+
+# Singleton instance
+_cache = None
+_cache_lock = threading.Lock()
+
+def get_cache():
+    """Get or create the search cache for the configured backend"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            if SEARCH_CACHE_BACKEND == "sqlite":
+                try:
+                    _cache = SQLiteCache()
+                except sqlite3.Error as e:
+                    logger.error(f"Error opening search cache at {SEARCH_CACHE_PATH}: {e}")
+                    logger.info("Falling back to in-memory search cache")
+                    _cache = MemoryCache()
+            else:
+                _cache = MemoryCache()
+    return _cache
@@ -0,0 +1,198 @@
+import json
+import os
+import logging
+from contextlib import closing
+from typing import Any, Callable, Dict, Iterator, List, Optional
+from dotenv import load_dotenv
+
+from database import parse_salary
+from indeed_scraper import INDEED_EXPERIENCE_LEVELS, INDEED_JOB_TYPES
+from search_cache import normalize_query
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Jobs scraped per search before filtering
+SCRAPE_LIMIT = 25
+
+# When some filters can only be checked after scraping, scrape up to this many times the
+# limit, page by page, until limit jobs pass them
+SEARCH_OVERFETCH_FACTOR = int(os.getenv("SEARCH_OVERFETCH_FACTOR", "4"))
+
+# Experience levels as clients send them, mapped to the values stored in jobs.experience_level
+EXPERIENCE_LEVEL_ALIASES = {
+    "junior": "Junior", "entry-level": "Junior", "entry level": "Junior", "entry": "Junior",
+    "mid-level": "Mid-level", "mid level": "Mid-level", "mid": "Mid-level",
+    "senior": "Senior", "expert": "Senior"
+}
+
+# Search categories implied by an experience level
+EXPERIENCE_LEVEL_CATEGORIES = {"Junior": "entry_level", "Senior": "senior"}
+
+class SearchPlan:
+    def __init__(self, keywords: List[str], location: Optional[str], categories: List[str],
+                 job_type: Optional[str], experience_level: Optional[str],
+                 min_salary: Optional[int], max_salary: Optional[int], limit: int = SCRAPE_LIMIT):
+        """
+        One search compiled into the filters each source applies.
+
+        The jobs table applies every filter in SQL. Indeed applies the job type and
+        experience level as URL filters (see indeed_scraper.INDEED_JOB_TYPES and
+        INDEED_EXPERIENCE_LEVELS); the salary bounds, and any job type or experience
+        level Indeed has no filter for, are checked on each scraped job.
+
+        Args:
+            keywords: Search keywords, role words included
+            location: Location to search in
+            categories: Categories from SEARCH_TERM_DICT
+            job_type: Job type as stored in jobs.job_type
+            experience_level: Experience level as stored in jobs.experience_level
+            min_salary: Minimum annual salary in thousands
+            max_salary: Maximum annual salary in thousands
+            limit: Jobs wanted from a scrape
+        """
+        self.keywords = keywords
+        self.location = location
+        self.categories = categories
+        self.job_type = job_type
+        self.experience_level = experience_level
+        self.min_salary = min_salary
+        self.max_salary = max_salary
+        self.limit = limit
+
+        self.source_filters: Dict[str, str] = {}
+        if job_type in INDEED_JOB_TYPES:
+            self.source_filters["job_type"] = job_type
+        if experience_level in INDEED_EXPERIENCE_LEVELS:
+            self.source_filters["experience_level"] = experience_level
+
+    def db_filters(self) -> Dict[str, Any]:
+        """Filters for database.get_jobs_page, which applies all of them in SQL"""
+        return {
+            "keywords": " ".join(self.keywords),
+            "location": self.location,
+            "job_type": self.job_type,
+            "experience_level": self.experience_level,
+            "min_salary": self.min_salary,
+            "max_salary": self.max_salary
+        }
+
+    @property
+    def residual(self) -> bool:
+        """Whether some filters have to be checked on scraped jobs"""
+        return bool(
+            (self.job_type and "job_type" not in self.source_filters)
+            or (self.experience_level and "experience_level" not in self.source_filters)
+            or self.min_salary or self.max_salary
+        )
+
+    def matches(self, job: Dict[str, Any]) -> bool:
+        """Check a scraped job against the filters its source didn't apply"""
+        if self.job_type and "job_type" not in self.source_filters and job.get("job_type") != self.job_type:
+            return False
+
+        if (self.experience_level and "experience_level" not in self.source_filters
+                and job.get("experience_level") != self.experience_level):
+            return False
+
+        if self.min_salary or self.max_salary:
+            # Annual bounds set when the job was stored, parsed here for jobs that weren't
+            if "salary_min" in job:
+                salary_min, salary_max = job["salary_min"], job["salary_max"]
+            else:
+                salary_min, salary_max = parse_salary(job.get("salary_range"))[:2]
+            # Apply the bounds as get_jobs_page does in SQL, so a search returns the same jobs
+            # whether scraped or read from the jobs table: jobs whose salary can't be parsed
+            # are dropped, and the minimum only applies above 10k
+            if (self.min_salary and self.min_salary > 10
+                    and (salary_min is None or salary_min < self.min_salary * 1000)):
+                return False
+            if self.max_salary and (salary_max is None or salary_max > self.max_salary * 1000):
+                return False
+
+        return True
+
+    def scrape_key(self) -> str:
+        """Search cache key of the scrape for this search"""
+        return normalize_query(self.keywords, self.location, self.categories, self.fetch_limit, self.source_filters)
+
+    def flight_key(self) -> str:
+        """Key shared by concurrent searches that produce the same results"""
+        return json.dumps([
+            self.scrape_key(),
+            self.job_type if "job_type" not in self.source_filters else None,
+            self.experience_level if "experience_level" not in self.source_filters else None,
+            self.min_salary,
+            self.max_salary,
+            self.limit
+        ])
+
+    @property
+    def fetch_limit(self) -> int:
+        """Most jobs scraped to find limit matching ones"""
+        return self.limit * max(1, SEARCH_OVERFETCH_FACTOR) if self.residual else self.limit
+
+    def scrape(self, source: Callable[..., Iterator[Dict[str, Any]]]) -> Iterator[Dict[str, Any]]:
+        """
+        Scrape matching jobs until limit of them are found.
+
+        The source yields jobs page by page, so it loads only as many result pages as
+        the filters need, up to fetch_limit jobs.
+
+        Args:
+            source: indeed_scraper.stream_jobs or a function with the same signature
+        """
+        found = 0
+        scraped = 0
+        # Closing the source as soon as enough jobs match stops it before the next page
+        with closing(source(self.keywords, self.location, self.categories, self.fetch_limit, self.source_filters)) as jobs:
+            for job in jobs:
+                scraped += 1
+                if self.matches(job):
+                    found += 1
+                    yield job
+                    if found >= self.limit:
+                        break
+        if self.residual:
+            logger.info(f"Scraped {scraped} jobs to find {found} matching the filters")
+
+def compile_search(keywords: Optional[str] = None, role: Optional[str] = None, location: Optional[str] = None,
+                   job_type: Optional[str] = None, experience_level: Optional[str] = None,
+                   min_salary: Optional[int] = None, max_salary: Optional[int] = None,
+                   remote_only: Optional[bool] = False, categories: Optional[List[str]] = None,
+                   limit: int = SCRAPE_LIMIT) -> SearchPlan:
+    """
+    Compile the parameters of a search request into a SearchPlan.
+
+    Role words are searched as keywords, remote_only and the experience level add
+    their categories, and experience levels are mapped to their stored values.
+    """
+    search_keywords = []
+    if keywords:
+        search_keywords.extend(keywords.split())
+    if role:
+        search_keywords.extend(role.split())
+
+    search_categories = list(categories or [])
+    if remote_only:
+        search_categories.append("remote")
+
+    if experience_level:
+        experience_level = EXPERIENCE_LEVEL_ALIASES.get(experience_level.strip().lower(), experience_level)
+        if experience_level in EXPERIENCE_LEVEL_CATEGORIES:
+            search_categories.append(EXPERIENCE_LEVEL_CATEGORIES[experience_level])
+
+    return SearchPlan(
+        keywords=search_keywords,
+        location=location,
+        categories=search_categories,
+        job_type=job_type or None,
+        experience_level=experience_level or None,
+        min_salary=min_salary,
+        max_salary=max_salary,
+        limit=limit
+    )
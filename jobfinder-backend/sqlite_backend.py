@@ -0,0 +1,637 @@
+import json
+import os
+import re
+import sqlite3
+import threading
+import logging
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from dotenv import load_dotenv
+
+import database
+from memory_store import tokenize
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+# Load environment variables
+load_dotenv()
+
+# Database file used when DB_BACKEND is sqlite
+SQLITE_DB_PATH = os.getenv("SQLITE_DB_PATH", "jobfinder.db")
+
+# Seconds a writer waits for another connection's write lock before failing
+SQLITE_BUSY_TIMEOUT = float(os.getenv("SQLITE_BUSY_TIMEOUT", "10"))
+
+# Keyword weights of the title, skills and description columns, like ts_rank_cd's A, B and C weights
+FTS_WEIGHTS = (1.0, 0.4, 0.2)
+
+# Timestamps are stored as fixed-width UTC ISO 8601 text, so they sort and compare as text
+TIMESTAMP_FORMAT = "%Y-%m-%dT%H:%M:%S.%f+00:00"
+NOW = "(strftime('%Y-%m-%dT%H:%M:%f', 'now') || '000+00:00')"
+
+def to_timestamp(value: datetime) -> str:
+    """Stored form of a datetime (naive datetimes are taken as UTC)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc).strftime(TIMESTAMP_FORMAT)
+
+# Columns are declared with these types so rows come back with the same Python types as from PostgreSQL
+sqlite3.register_converter("TIMESTAMP", lambda value: datetime.fromisoformat(value.decode()))
+sqlite3.register_converter("BOOLEAN", lambda value: bool(int(value)))
+sqlite3.register_converter("JSON", lambda value: json.loads(value))
+
+def create_tables(conn: sqlite3.Connection) -> None:
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            email TEXT UNIQUE NOT NULL,
+            password_hash TEXT NOT NULL,
+            first_name TEXT,
+            last_name TEXT,
+            created_at TIMESTAMP DEFAULT {NOW},
+            last_login TIMESTAMP
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS users_email_lower_idx ON users (lower(email))")
+
+    # skills is a JSON array, which the full-text index tokenizes like a list of words
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            title TEXT NOT NULL,
+            company TEXT NOT NULL,
+            location TEXT NOT NULL,
+            description TEXT NOT NULL,
+            salary_range TEXT,
+            job_type TEXT,
+            experience_level TEXT,
+            skills JSON,
+            posted_at TIMESTAMP DEFAULT {NOW},
+            link TEXT,
+            salary_min INTEGER,
+            salary_max INTEGER,
+            salary_period TEXT,
+            UNIQUE (title, company, location)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS jobs_posted_at_id_idx ON jobs (posted_at DESC, id DESC)")
+    conn.execute("CREATE INDEX IF NOT EXISTS jobs_salary_min_idx ON jobs (salary_min)")
+    conn.execute("CREATE INDEX IF NOT EXISTS jobs_salary_max_idx ON jobs (salary_max)")
+    conn.execute("CREATE INDEX IF NOT EXISTS jobs_job_type_idx ON jobs (job_type)")
+    conn.execute("CREATE INDEX IF NOT EXISTS jobs_experience_level_idx ON jobs (experience_level)")
+
+    # Full-text index over the jobs table, kept in step by triggers. The porter stemmer
+    # matches word forms like the english text search configuration, and + and # are
+    # word characters so C++ and C# stay searchable.
+    conn.execute("""
+        CREATE VIRTUAL TABLE IF NOT EXISTS jobs_fts USING fts5(
+            title, skills, description,
+            content='jobs', content_rowid='id',
+            tokenize="porter unicode61 tokenchars '+#'"
+        )
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_insert AFTER INSERT ON jobs BEGIN
+            INSERT INTO jobs_fts (rowid, title, skills, description)
+            VALUES (new.id, new.title, new.skills, new.description);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_delete AFTER DELETE ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, skills, description)
+            VALUES ('delete', old.id, old.title, old.skills, old.description);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS jobs_fts_update AFTER UPDATE OF title, skills, description ON jobs BEGIN
+            INSERT INTO jobs_fts (jobs_fts, rowid, title, skills, description)
+            VALUES ('delete', old.id, old.title, old.skills, old.description);
+            INSERT INTO jobs_fts (rowid, title, skills, description)
+            VALUES (new.id, new.title, new.skills, new.description);
+        END
+    """)
+
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS user_preferences (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+            email_notifications BOOLEAN DEFAULT 0,
+            new_job_alerts BOOLEAN DEFAULT 0,
+            application_updates BOOLEAN DEFAULT 0,
+            marketing_emails BOOLEAN DEFAULT 0,
+            saved_searches JSON,
+            preferred_job_types JSON,
+            created_at TIMESTAMP DEFAULT {NOW},
+            updated_at TIMESTAMP DEFAULT {NOW}
+        )
+    """)
+
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS saved_jobs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+            job_id INTEGER REFERENCES jobs(id) ON DELETE CASCADE,
+            saved_at TIMESTAMP DEFAULT {NOW},
+            UNIQUE (user_id, job_id)
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS saved_jobs_user_id_saved_at_idx ON saved_jobs (user_id, saved_at DESC)")
+
+    conn.execute(f"""
+        CREATE TABLE IF NOT EXISTS job_applications (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            user_id INTEGER REFERENCES users(id) ON DELETE CASCADE,
+            job_id INTEGER REFERENCES jobs(id) ON DELETE CASCADE,
+            status TEXT DEFAULT 'applied',
+            applied_at TIMESTAMP DEFAULT {NOW},
+            updated_at TIMESTAMP DEFAULT {NOW},
+            UNIQUE (user_id, job_id)
+        )
+    """)
+
+def add_saved_jobs_version(conn: sqlite3.Connection) -> None:
+    conn.execute("ALTER TABLE users ADD COLUMN saved_jobs_version INTEGER NOT NULL DEFAULT 0")
+
+def add_unique_email_lower_index(conn: sqlite3.Connection) -> None:
+    # Emails are unique regardless of case, as get_user_by_email looks them up; the
+    # column's UNIQUE constraint alone lets "A@b.com" and "a@b.com" both register
+    duplicates = [row[0] for row in conn.execute(
+        "SELECT lower(email) FROM users GROUP BY lower(email) HAVING count(*) > 1"
+    )]
+    if duplicates:
+        # Separate accounts with their own passwords can't be merged automatically
+        raise RuntimeError(
+            f"Users share emails that differ only in case ({', '.join(duplicates)}); "
+            "merge or remove the duplicate accounts, then restart"
+        )
+    conn.execute("DROP INDEX IF EXISTS users_email_lower_idx")
+    conn.execute("CREATE UNIQUE INDEX users_email_lower_idx ON users (lower(email))")
+
+# (version, description, apply) in the order they are applied; the applied version is
+# kept in PRAGMA user_version. Append new migrations with the next version number.
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "Create tables", create_tables),
+    (2, "Saved jobs version counter on users", add_saved_jobs_version),
+    (3, "Unique index on lower(email)", add_unique_email_lower_index),
+]
+
+# Connections are opened per thread and closed together by close()
+_local = threading.local()
+_connections: List[sqlite3.Connection] = []
+_connections_lock = threading.Lock()
+
+def _connect() -> sqlite3.Connection:
+    conn = sqlite3.connect(
+        SQLITE_DB_PATH,
+        timeout=SQLITE_BUSY_TIMEOUT,
+        isolation_level=None,
+        detect_types=sqlite3.PARSE_DECLTYPES,
+        check_same_thread=False
+    )
+    conn.row_factory = sqlite3.Row
+    # WAL lets readers run alongside the single writer; NORMAL sync is durable across process crashes
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+def get_connection() -> sqlite3.Connection:
+    """
+    Get this thread's connection to the SQLite database, opening it on first use.
+    """
+    conn = getattr(_local, "conn", None)
+    if conn is None:
+        conn = _connect()
+        _local.conn = conn
+        with _connections_lock:
+            _connections.append(conn)
+    return conn
+
+@contextmanager
+def transaction() -> Iterator[sqlite3.Connection]:
+    """
+    Run the block in a write transaction on this thread's connection. BEGIN IMMEDIATE takes
+    the write lock up front, so read-modify-write blocks are atomic; the transaction is
+    rolled back if the block raises.
+    """
+    conn = get_connection()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield conn
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    conn.execute("COMMIT")
+
+def close() -> None:
+    """
+    Close every open connection to the SQLite database.
+    """
+    with _connections_lock:
+        for conn in _connections:
+            conn.close()
+        _connections.clear()
+    _local.__dict__.clear()
+
+def _rows(cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+    return [dict(row) for row in cursor.fetchall()]
+
+def initialize_database() -> int:
+    """
+    Apply pending migrations and add sample jobs to an empty database.
+
+    Returns:
+        Number of migrations applied
+    """
+    applied = 0
+    with transaction() as conn:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        for number, description, apply in MIGRATIONS:
+            if number <= version:
+                continue
+            logger.info(f"Applying SQLite migration {number}: {description}")
+            apply(conn)
+            # PRAGMA doesn't take parameters; number is one of ours
+            conn.execute(f"PRAGMA user_version = {int(number)}")
+            applied += 1
+
+        if conn.execute("SELECT NOT EXISTS (SELECT 1 FROM jobs)").fetchone()[0]:
+            logger.info("Adding sample job data")
+            conn.executemany(
+                """
+                INSERT INTO jobs
+                (title, company, location, description, salary_range, job_type, experience_level, skills,
+                 salary_min, salary_max, salary_period)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (title, company, location) DO NOTHING
+                """,
+                [
+                    (
+                        job["title"],
+                        job["company"],
+                        job["location"],
+                        job["description"],
+                        job["salary_range"],
+                        job["job_type"],
+                        job["experience_level"],
+                        json.dumps(job["skills"]),
+                        *database.parse_salary(job["salary_range"])
+                    )
+                    for job in database.MOCK_JOBS
+                ]
+            )
+
+    logger.info(f"SQLite database {SQLITE_DB_PATH} is at version {MIGRATIONS[-1][0]}")
+    return applied
+
+def fts_query(keywords: str) -> Tuple[Optional[str], List[str]]:
+    """
+    Translate keywords into FTS5 queries with the semantics of websearch_to_tsquery:
+    every term must match, "quoted phrases" match in order, -term excludes and OR
+    separates alternatives. Stop words are dropped.
+
+    FTS5 has no unary NOT, so an alternative made only of exclusions is returned as a
+    query of the terms it excludes; jobs matching none of them match the alternative.
+
+    Returns:
+        The FTS5 query of the alternatives with required terms (None if there are none),
+        and one query per exclusion-only alternative. Both are empty if the keywords
+        hold no searchable terms (which matches every job)
+    """
+    alternatives, exclusions = [], []
+    for alternative in re.split(r"\s+or\s+", keywords.strip(), flags=re.IGNORECASE):
+        required, excluded = [], []
+        for term in re.findall(r'-?"[^"]*"|\S+', alternative):
+            words = tokenize(term)
+            if words:
+                # Quoting makes every word a literal string, never FTS5 syntax
+                phrase = '"' + " ".join(words) + '"'
+                (excluded if term.startswith("-") else required).append(phrase)
+        if required:
+            alternatives.append(" AND ".join(required) + "".join(f" NOT {phrase}" for phrase in excluded))
+        elif excluded:
+            exclusions.append(" OR ".join(excluded))
+
+    match = " OR ".join(f"({alternative})" for alternative in alternatives) if alternatives else None
+    return match, exclusions
+
+def get_jobs_page(filters: Optional[Dict[str, Any]] = None, limit: Optional[int] = None,
+                  cursor: Optional[str] = None) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Get one page of jobs with optional filtering; see database.get_jobs_page.
+
+    Raises:
+        ValueError: If the cursor is invalid
+    """
+    keywords = (filters or {}).get("keywords")
+    after = database.parse_jobs_cursor(cursor, keywords)
+    if after:
+        after[-2] = to_timestamp(after[-2])
+
+    columns = ", ".join(f"j.{column}" for column in database.JOB_COLUMNS)
+    params: List[Any] = []
+    if keywords:
+        match, exclusions = fts_query(keywords)
+        # bm25 is lower for better matches; negate it so ranks sort like ts_rank_cd
+        bm25 = f"-bm25(jobs_fts, {', '.join(str(weight) for weight in FTS_WEIGHTS)})"
+        if match and not exclusions:
+            rank = bm25
+            query = f"""
+                SELECT {columns}, {rank} AS search_rank
+                FROM jobs_fts JOIN jobs j ON j.id = jobs_fts.rowid
+                WHERE jobs_fts MATCH ?
+            """
+            params.append(match)
+        elif exclusions:
+            # Jobs match an exclusion-only alternative by matching none of its terms, and
+            # rank 0 for it, like ts_rank_cd of a query with nothing to match
+            conditions = ["j.id NOT IN (SELECT rowid FROM jobs_fts WHERE jobs_fts MATCH ?)"] * len(exclusions)
+            if match:
+                rank = "COALESCE(m.search_rank, 0.0)"
+                query = f"""
+                    SELECT {columns}, {rank} AS search_rank
+                    FROM jobs j LEFT JOIN (
+                        SELECT rowid, {bm25} AS search_rank FROM jobs_fts WHERE jobs_fts MATCH ?
+                    ) m ON m.rowid = j.id
+                    WHERE (m.rowid IS NOT NULL OR {" OR ".join(conditions)})
+                """
+                params.append(match)
+            else:
+                rank = "0.0"
+                query = f"SELECT {columns}, 0.0 AS search_rank FROM jobs j WHERE ({' OR '.join(conditions)})"
+            params.extend(exclusions)
+        else:
+            rank = "0.0"
+            query = f"SELECT {columns}, 0.0 AS search_rank FROM jobs j WHERE 1=1"
+        order_by = "search_rank DESC, j.posted_at DESC, j.id DESC"
+        if after:
+            query += f" AND ({rank}, j.posted_at, j.id) < (?, ?, ?)"
+            params.extend(after)
+    else:
+        query = f"SELECT {columns} FROM jobs j WHERE 1=1"
+        order_by = "j.posted_at DESC, j.id DESC"
+        if after:
+            # Served by jobs_posted_at_id_idx
+            query += " AND (j.posted_at, j.id) < (?, ?)"
+            params.extend(after)
+
+    if filters:
+        # LIKE is case-insensitive for ASCII, like ILIKE
+        if filters.get("location"):
+            query += " AND j.location LIKE ?"
+            params.append(f"%{filters['location']}%")
+
+        if filters.get("job_type"):
+            query += " AND j.job_type = ?"
+            params.append(filters["job_type"])
+
+        if filters.get("experience_level"):
+            query += " AND j.experience_level = ?"
+            params.append(filters["experience_level"])
+
+        # Salary filters are in thousands per year; the minimum only applies above 10k
+        if filters.get("min_salary") and int(filters["min_salary"]) > 10:
+            query += " AND j.salary_min >= ?"
+            params.append(int(filters["min_salary"]) * 1000)
+
+        if filters.get("max_salary"):
+            query += " AND j.salary_max <= ?"
+            params.append(int(filters["max_salary"]) * 1000)
+
+    query += f" ORDER BY {order_by}"
+    if limit is not None:
+        # One extra row tells whether there is a next page
+        query += " LIMIT ?"
+        params.append(limit + 1)
+
+    results = _rows(get_connection().execute(query, params))
+    return database.finish_jobs_page(results, limit, keywords)
+
+def upsert_jobs(jobs: List[Dict[str, Any]]) -> List[Optional[int]]:
+    """
+    Insert scraped jobs in one transaction, skipping jobs that already exist; see database.upsert_jobs.
+    """
+    limits = database.JOB_FIELD_LIMITS
+    rows = []
+    for job in jobs:
+        job["salary_min"], job["salary_max"], job["salary_period"] = database.parse_salary(job.get("salary_range"))
+        row = {field: (job.get(field) or "")[:size] for field, size in limits.items()}
+        rows.append((
+            row["title"],
+            row["company"],
+            row["location"],
+            job.get("description") or "",
+            row["salary_range"],
+            row["job_type"],
+            row["experience_level"],
+            json.dumps(job.get("skills") or []),
+            to_timestamp(database.parse_posted_at(job.get("posted_at"))),
+            job.get("link"),
+            job["salary_min"],
+            job["salary_max"],
+            job["salary_period"]
+        ))
+
+    with transaction() as conn:
+        conn.executemany(
+            """
+            INSERT INTO jobs (title, company, location, description, salary_range, job_type,
+                              experience_level, skills, posted_at, link,
+                              salary_min, salary_max, salary_period)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (title, company, location) DO NOTHING
+            """,
+            rows
+        )
+        ids = []
+        for job, row in zip(jobs, rows):
+            found = conn.execute(
+                "SELECT id FROM jobs WHERE title = ? AND company = ? AND location = ?", row[:3]
+            ).fetchone()
+            job["db_id"] = found["id"] if found else None
+            ids.append(job["db_id"])
+
+    return ids
+
+def backfill_salaries(batch_size: int = 1000) -> int:
+    """
+    Fill the salary columns of jobs stored without them; see database.backfill_salaries.
+    """
+    updated = 0
+    last_id = 0
+    while True:
+        with transaction() as conn:
+            rows = conn.execute(
+                """
+                SELECT id, salary_range FROM jobs
+                WHERE id > ? AND salary_period IS NULL AND salary_range <> ''
+                ORDER BY id
+                LIMIT ?
+                """,
+                (last_id, batch_size)
+            ).fetchall()
+            if not rows:
+                break
+
+            last_id = rows[-1]["id"]
+            conn.executemany(
+                "UPDATE jobs SET salary_min = ?, salary_max = ?, salary_period = ? WHERE id = ?",
+                [(*database.parse_salary(row["salary_range"]), row["id"]) for row in rows]
+            )
+        updated += len(rows)
+        logger.info(f"Backfilled salaries for {updated} jobs")
+
+    return updated
+
+def update_user_preferences(user_id: int, preferences: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Update user preferences, creating them on first use; see database.update_user_preferences.
+    """
+    values = {}
+    for key, value in preferences.items():
+        if key in database.PREFERENCE_FIELDS:
+            values[key] = json.dumps(value) if key in ("saved_searches", "preferred_job_types") else value
+
+    with transaction() as conn:
+        existing = conn.execute("SELECT * FROM user_preferences WHERE user_id = ?", (user_id,)).fetchone()
+
+        if existing:
+            if not values:
+                return dict(existing)
+            set_clauses = [f"{key} = ?" for key in values]
+            row = conn.execute(
+                f"""
+                UPDATE user_preferences SET {', '.join(set_clauses)}, updated_at = {NOW}
+                WHERE user_id = ? RETURNING *
+                """,
+                (*values.values(), user_id)
+            ).fetchone()
+        else:
+            values.setdefault("email_notifications", False)
+            columns = ["user_id", *values]
+            row = conn.execute(
+                f"""
+                INSERT INTO user_preferences ({', '.join(columns)})
+                VALUES ({', '.join(['?'] * len(columns))})
+                RETURNING *
+                """,
+                (user_id, *values.values())
+            ).fetchone()
+
+        return dict(row)
+
+def create_user(email: str, password_hash: str, first_name: str = None, last_name: str = None) -> Dict[str, Any]:
+    """
+    Create a new user.
+
+    Raises:
+        ValueError: If a user with this email already exists
+    """
+    try:
+        with transaction() as conn:
+            row = conn.execute(
+                """
+                INSERT INTO users (email, password_hash, first_name, last_name)
+                VALUES (?, ?, ?, ?)
+                RETURNING id, email, first_name, last_name, created_at
+                """,
+                (email, password_hash, first_name, last_name)
+            ).fetchone()
+            return dict(row)
+    except sqlite3.IntegrityError:
+        raise ValueError("Email already registered")
+
+def get_user_by_email(email: str) -> Optional[Dict[str, Any]]:
+    """
+    Get a user by email, case-insensitively (served by users_email_lower_idx).
+    """
+    row = get_connection().execute(
+        "SELECT * FROM users WHERE lower(email) = lower(?) ORDER BY id LIMIT 1", (email,)
+    ).fetchone()
+    return dict(row) if row else None
+
+def update_last_login(user_id: int) -> None:
+    """
+    Update a user's last login timestamp.
+    """
+    with transaction() as conn:
+        conn.execute(f"UPDATE users SET last_login = {NOW} WHERE id = ?", (user_id,))
+
+def _bump_saved_jobs_version(conn: sqlite3.Connection, user_id: int) -> None:
+    conn.execute("UPDATE users SET saved_jobs_version = saved_jobs_version + 1 WHERE id = ?", (user_id,))
+
+def get_saved_jobs_version(user_id: int) -> int:
+    """
+    Get the version of a user's saved jobs; see database.get_saved_jobs_version.
+    """
+    row = get_connection().execute("SELECT saved_jobs_version FROM users WHERE id = ?", (user_id,)).fetchone()
+    return row["saved_jobs_version"] if row else 0
+
+def save_jobs_for_user(user_id: int, job_ids: List[int]) -> List[Dict[str, Any]]:
+    """
+    Save several jobs for a user in one transaction; see database.save_jobs_for_user.
+    """
+    if not job_ids:
+        return []
+
+    ids = json.dumps(job_ids)
+    with transaction() as conn:
+        existing = _rows(conn.execute(
+            "SELECT * FROM saved_jobs WHERE user_id = ? AND job_id IN (SELECT value FROM json_each(?))",
+            (user_id, ids)
+        ))
+        # Selecting the ids from jobs skips unknown jobs instead of failing on the foreign key
+        inserted = _rows(conn.execute(
+            """
+            INSERT INTO saved_jobs (user_id, job_id)
+            SELECT ?, id FROM jobs WHERE id IN (SELECT value FROM json_each(?))
+            ON CONFLICT (user_id, job_id) DO NOTHING
+            RETURNING *
+            """,
+            (user_id, ids)
+        ))
+        if inserted:
+            _bump_saved_jobs_version(conn, user_id)
+
+    return [{**row, "created": True} for row in inserted] + [{**row, "created": False} for row in existing]
+
+def get_saved_jobs(user_id: int) -> List[Dict[str, Any]]:
+    """
+    Get a user's saved jobs with their saved_at time, most recently saved first.
+    """
+    columns = ", ".join(f"j.{column}" for column in database.JOB_COLUMNS)
+    return _rows(get_connection().execute(
+        f"""
+        SELECT {columns}, sj.saved_at
+        FROM jobs j
+        JOIN saved_jobs sj ON j.id = sj.job_id
+        WHERE sj.user_id = ?
+        ORDER BY sj.saved_at DESC
+        """,
+        (user_id,)
+    ))
+
+def unsave_jobs_for_user(user_id: int, job_ids: List[int]) -> List[int]:
+    """
+    Remove several jobs from a user's saved jobs; see database.unsave_jobs_for_user.
+    """
+    if not job_ids:
+        return []
+
+    with transaction() as conn:
+        rows = conn.execute(
+            """
+            DELETE FROM saved_jobs
+            WHERE user_id = ? AND job_id IN (SELECT value FROM json_each(?))
+            RETURNING job_id
+            """,
+            (user_id, json.dumps(job_ids))
+        ).fetchall()
+        if rows:
+            _bump_saved_jobs_version(conn, user_id)
+
+    return [row["job_id"] for row in rows]
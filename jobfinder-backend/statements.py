@@ -0,0 +1,141 @@
+import itertools
+import re
+import threading
+import time
+import weakref
+import logging
+from typing import Any, Dict, List, Sequence
+
+# Configure logging
+logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+logger = logging.getLogger(__name__)
+
+def numbered_placeholders(query: str) -> str:
+    """Turn the %s placeholders of a psycopg2 query into PostgreSQL's $1, $2, ..."""
+    counter = itertools.count(1)
+    return re.sub(r"%s", lambda _: f"${next(counter)}", query)
+
+class StatementStats:
+    """Call count and latency of one statement"""
+
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "total_ms": round(self.total_seconds * 1000, 3),
+            "mean_ms": round(self.total_seconds * 1000 / self.calls, 3) if self.calls else 0.0,
+            "max_ms": round(self.max_seconds * 1000, 3)
+        }
+
+class StatementRegistry:
+    def __init__(self):
+        """
+        Registry of named prepared statements.
+
+        Statements are written with %s placeholders like any psycopg2 query. On a psycopg2
+        connection a statement is PREPAREd the first time it runs there and EXECUTEd by
+        name afterwards, so PostgreSQL parses and plans it once per pooled connection
+        instead of on every call. asyncpg prepares every query it runs and caches the
+        prepared statement on the connection, so the async path sends the same SQL text
+        and gets the same reuse. Call counts and latencies are kept per statement.
+        """
+        self._statements: Dict[str, str] = {}  # name -> SQL with $n placeholders
+        self._params: Dict[str, int] = {}  # name -> number of parameters
+        self._stats: Dict[str, StatementStats] = {}
+        # Statement names prepared on each psycopg2 connection; entries go away with the connection
+        self._prepared = weakref.WeakKeyDictionary()
+        self._lock = threading.Lock()
+
+    def register(self, name: str, query: str) -> str:
+        """
+        Register a statement.
+
+        Args:
+            name: Statement name, a valid SQL identifier
+            query: SQL with %s placeholders
+
+        Returns:
+            The name, to execute the statement with
+        """
+        if not re.fullmatch(r"[a-z_][a-z0-9_]*", name):
+            raise ValueError(f"Invalid statement name: {name}")
+        self._statements[name] = numbered_placeholders(query)
+        self._params[name] = query.count("%s")
+        self._stats[name] = StatementStats()
+        return name
+
+    def sql(self, name: str) -> str:
+        """SQL of a registered statement, with $n placeholders"""
+        return self._statements[name]
+
+    def _record(self, name: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            stats = self._stats[name]
+            stats.calls += 1
+            stats.total_seconds += seconds
+            stats.max_seconds = max(stats.max_seconds, seconds)
+            if error:
+                stats.errors += 1
+
+    def execute(self, cur, name: str, params: Sequence[Any] = ()) -> None:
+        """
+        Run a registered statement on a psycopg2 cursor, preparing it on the cursor's
+        connection first if needed. Fetch the results from the cursor as usual.
+        """
+        if len(params) != self._params[name]:
+            raise ValueError(f"Statement {name} takes {self._params[name]} parameter(s), got {len(params)}")
+
+        start = time.perf_counter()
+        try:
+            with self._lock:
+                prepared = self._prepared.setdefault(cur.connection, set())
+            # Prepared statements belong to the session and survive rollbacks, so preparing
+            # once per connection is enough
+            if name not in prepared:
+                cur.execute(f"PREPARE {name} AS {self._statements[name]}")
+                prepared.add(name)
+            if params:
+                cur.execute(f"EXECUTE {name} ({', '.join(['%s'] * len(params))})", params)
+            else:
+                cur.execute(f"EXECUTE {name}")
+        except Exception:
+            self._record(name, time.perf_counter() - start, error=True)
+            raise
+        self._record(name, time.perf_counter() - start)
+
+    async def fetch(self, conn, name: str, *args) -> List[Any]:
+        """Run a registered statement on an asyncpg connection and return all rows"""
+        start = time.perf_counter()
+        try:
+            rows = await conn.fetch(self._statements[name], *args)
+        except Exception:
+            self._record(name, time.perf_counter() - start, error=True)
+            raise
+        self._record(name, time.perf_counter() - start)
+        return rows
+
+    async def fetchrow(self, conn, name: str, *args) -> Any:
+        """Run a registered statement on an asyncpg connection and return the first row, or None"""
+        rows = await self.fetch(conn, name, *args)
+        return rows[0] if rows else None
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Call count, error count and latency in milliseconds of every registered statement"""
+        with self._lock:
+            return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+    def log_stats(self) -> None:
+        """Log call counts and latencies of the statements that ran"""
+        for name, stats in self.stats().items():
+            if stats["calls"]:
+                logger.info(f"Statement {name}: {stats['calls']} call(s), {stats['errors']} error(s), "
+                            f"mean {stats['mean_ms']} ms, max {stats['max_ms']} ms")
+
+# Statements shared by the sync and async database layers
+statements = StatementRegistry()
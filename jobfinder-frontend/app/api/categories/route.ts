@@ -4,21 +4,31 @@ const API_BASE_URL = process.env.BACKEND_API_URL || 'http://localhost:8000';
 
 export async function GET(request: NextRequest) {
   try {
-    // Forward the request to our FastAPI backend
+    // Forward the request to our FastAPI backend, revalidating the browser's copy if it has one
+    const ifNoneMatch = request.headers.get('if-none-match');
     const response = await fetch(`${API_BASE_URL}/api/categories`, {
       method: 'GET',
       headers: {
-        'Content-Type': 'application/json'
-      }
+        'Content-Type': 'application/json',
+        ...(ifNoneMatch ? { 'If-None-Match': ifNoneMatch } : {})
+      },
+      cache: 'no-store'
     });
     
+    const etag = response.headers.get('etag');
+    
+    // Categories haven't changed since the browser's copy
+    if (response.status === 304) {
+      return new NextResponse(null, { status: 304, headers: { 'ETag': etag ?? '' } });
+    }
+    
     if (!response.ok) {
       throw new Error(`Backend API error: ${response.status}`);
     }
     
     const data = await response.json();
     
-    return NextResponse.json(data);
+    return NextResponse.json(data, { headers: etag ? { 'ETag': etag } : undefined });
   } catch (error) {
     console.error('Error fetching categories:', error);
     return NextResponse.json(
@@ -0,0 +1,49 @@
+import { NextRequest, NextResponse } from "next/server";
+
+const API_BASE_URL = process.env.BACKEND_API_URL || 'http://localhost:8000';
+
+export async function POST(request: NextRequest) {
+  try {
+    // Get the authorization header
+    const authHeader = request.headers.get('authorization');
+    
+    if (!authHeader || !authHeader.startsWith('Bearer ')) {
+      return NextResponse.json(
+        { error: 'Unauthorized' },
+        { status: 401 }
+      );
+    }
+    
+    const body = await request.json();
+    
+    // Forward the request to our FastAPI backend
+    const response = await fetch(`${API_BASE_URL}/api/jobs/save/bulk`, {
+      method: 'POST',
+      headers: {
+        'Authorization': authHeader,
+        'Content-Type': 'application/json'
+      },
+      body: JSON.stringify(body)
+    });
+    
+    if (!response.ok) {
+      if (response.status === 401) {
+        return NextResponse.json(
+          { error: 'Unauthorized' },
+          { status: 401 }
+        );
+      }
+      throw new Error(`Backend API error: ${response.status}`);
+    }
+    
+    const data = await response.json();
+    
+    return NextResponse.json(data);
+  } catch (error) {
+    console.error('Error saving jobs:', error);
+    return NextResponse.json(
+      { error: 'Failed to update saved jobs' },
+      { status: 500 }
+    );
+  }
+} 
\ No newline at end of file
@@ -14,14 +14,27 @@ export async function GET(request: NextRequest) {
       );
     }
     
-    // Forward the request to our FastAPI backend
+    // Forward the request to our FastAPI backend, revalidating the browser's copy if it has one
+    const ifNoneMatch = request.headers.get('if-none-match');
     const response = await fetch(`${API_BASE_URL}/api/jobs/saved`, {
       method: 'GET',
       headers: {
-        'Authorization': authHeader
-      }
+        'Authorization': authHeader,
+        ...(ifNoneMatch ? { 'If-None-Match': ifNoneMatch } : {})
+      },
+      cache: 'no-store'
     });
     
+    const etag = response.headers.get('etag');
+    
+    // Saved jobs haven't changed since the browser's copy
+    if (response.status === 304) {
+      return new NextResponse(null, {
+        status: 304,
+        headers: { 'ETag': etag ?? '', 'Cache-Control': 'private, no-cache' }
+      });
+    }
+    
     if (!response.ok) {
       if (response.status === 401) {
         return NextResponse.json(
@@ -34,7 +47,9 @@ export async function GET(request: NextRequest) {
     
     const data = await response.json();
     
-    return NextResponse.json(data);
+    return NextResponse.json(data, {
+      headers: etag ? { 'ETag': etag, 'Cache-Control': 'private, no-cache' } : undefined
+    });
   } catch (error) {
     console.error('Error fetching saved jobs:', error);
     return NextResponse.json(
@@ -21,7 +21,12 @@ export async function POST(request: NextRequest) {
     
     const data = await response.json();
     
-    return NextResponse.json(data);
+    // Pass the cursor of the next page through to the client
+    const nextCursor = response.headers.get('X-Next-Cursor');
+    
+    return NextResponse.json(data, {
+      headers: nextCursor ? { 'X-Next-Cursor': nextCursor } : undefined
+    });
   } catch (error) {
     console.error('Error searching jobs:', error);
     return NextResponse.json(